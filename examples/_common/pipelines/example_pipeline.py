@@ -6,26 +6,116 @@ received by the FlowerPower MQTT plugin. Place this file in your
 FlowerPower project's pipelines/ directory.
 """
 
+import atexit
+import io
+import os
+import threading
+import time
+from bisect import bisect_right
+import msgspec
+from msgspec import Struct
 import pandas as pd
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from hamilton.function_modifiers import parameterize
 from pathlib import Path
 
+# Classification tables: a reading below _TEMP_BINS[i] gets _TEMP_LABELS[i],
+# a reading at or above the last bin gets the last label.
+_TEMP_BINS = (0.0, 10.0, 25.0, 35.0)
+_TEMP_LABELS = ("freezing", "cold", "normal", "warm", "hot")
+_HUMIDITY_BINS = (30.0, 60.0)
+_HUMIDITY_LABELS = ("dry", "normal", "humid")
+
+# Alerting status codes as bit masks: bit i is set if label i raises an alert
+# (temperature: freezing/hot, humidity: dry/humid).
+_TEMP_ALERT_MASK = 0b10001
+_HUMIDITY_ALERT_MASK = 0b101
+
+class Metadata(Struct, frozen=True):
+    """MQTT context of a processed message."""
+    topic: str
+    qos: str
+    timestamp: str
+    processing_time: str
+
+
+class Alerts(Struct, frozen=True):
+    """Alert flags derived from the reading status."""
+    temperature_alert: bool
+    humidity_alert: bool
+    combined_alert: bool
+
+
+_LOG_PATH = Path("mqtt_processing.log")
+_LOG_RESULT = f"Logged to {_LOG_PATH}"
+
+# The log file stays open between messages and writes are buffered. The
+# buffer is flushed once it holds _LOG_BUFFER_SIZE bytes, by the first write
+# more than _LOG_FLUSH_INTERVAL seconds after the previous flush, and at exit.
+# A forked process (e.g. an RQ work-horse, which leaves via os._exit and
+# skips atexit) starts with an empty buffer and flushes its first record.
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_INTERVAL = 1.0
+_LOG_LOCK = threading.Lock()
+_log_handle: Optional[io.BufferedWriter] = None
+_log_flushed_at = float("-inf")
+
+
+def _flush_log() -> None:
+    """Write out buffered log records."""
+    with _LOG_LOCK:
+        if _log_handle is not None:
+            _log_handle.flush()
+
+
+def _close_log() -> None:
+    """Flush and close the log file at interpreter exit."""
+    global _log_handle
+    with _LOG_LOCK:
+        if _log_handle is not None:
+            _log_handle.close()
+            _log_handle = None
+
+
+def _reset_log_after_fork() -> None:
+    """Give a forked child its own lock and an immediate first flush."""
+    global _LOG_LOCK, _log_flushed_at
+    _LOG_LOCK = threading.Lock()
+    _log_flushed_at = float("-inf")
+
+
+atexit.register(_close_log)
+if hasattr(os, "register_at_fork"):
+    # Flushing before fork keeps buffered records from being written twice
+    os.register_at_fork(before=_flush_log, after_in_child=_reset_log_after_fork)
+
+
+def _write_log(data: bytes) -> None:
+    """Append encoded records to the log file, opening it on first use."""
+    global _log_handle, _log_flushed_at
+    with _LOG_LOCK:
+        if _log_handle is None:
+            _log_handle = open(_LOG_PATH, "ab", buffering=_LOG_BUFFER_SIZE)
+        _log_handle.write(data)
+        now = time.monotonic()
+        if now - _log_flushed_at >= _LOG_FLUSH_INTERVAL:
+            _log_handle.flush()
+            _log_flushed_at = now
+
 
 def mqtt_message_data(mqtt_message: Dict[str, Any]) -> Dict[str, Any]:
     """Extract and validate MQTT message data."""
     return mqtt_message
 
 
-def mqtt_metadata(mqtt_topic: str, mqtt_qos: int, execution_timestamp: str) -> Dict[str, str]:
+def mqtt_metadata(mqtt_topic: str, mqtt_qos: int, execution_timestamp: str) -> Metadata:
     """Create metadata from MQTT message context."""
-    return {
-        "topic": mqtt_topic,
-        "qos": str(mqtt_qos),
-        "timestamp": execution_timestamp,
-        "processing_time": datetime.now().isoformat()
-    }
+    return Metadata(
+        topic=mqtt_topic,
+        qos=str(mqtt_qos),
+        timestamp=execution_timestamp,
+        processing_time=execution_timestamp
+    )
 
 
 def sensor_data(mqtt_message_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -41,111 +131,106 @@ def sensor_data(mqtt_message_data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def temperature_reading(sensor_data: Dict[str, Any]) -> float:
-    """Extract temperature reading."""
-    temp = sensor_data.get("temperature", 0.0)
-    return float(temp) if temp is not None else 0.0
+    """Extract temperature reading (a missing value reads as 0.0)."""
+    temp = sensor_data.get("temperature")
+    return 0.0 if temp is None else float(temp)
 
 
 def humidity_reading(sensor_data: Dict[str, Any]) -> float:
-    """Extract humidity reading."""
-    humidity = sensor_data.get("humidity", 0.0)
-    return float(humidity) if humidity is not None else 0.0
+    """Extract humidity reading (a missing value reads as 0.0)."""
+    humidity = sensor_data.get("humidity")
+    return 0.0 if humidity is None else float(humidity)
+
+
+def temperature_code(temperature_reading: float) -> int:
+    """Classify temperature reading as an index into the temperature labels."""
+    return bisect_right(_TEMP_BINS, temperature_reading)
+
 
+def humidity_code(humidity_reading: float) -> int:
+    """Classify humidity reading as an index into the humidity labels."""
+    return bisect_right(_HUMIDITY_BINS, humidity_reading)
 
-def temperature_status(temperature_reading: float) -> str:
+
+def temperature_status(temperature_code: int) -> str:
     """Classify temperature reading."""
-    if temperature_reading < 0:
-        return "freezing"
-    elif temperature_reading < 10:
-        return "cold" 
-    elif temperature_reading < 25:
-        return "normal"
-    elif temperature_reading < 35:
-        return "warm"
-    else:
-        return "hot"
+    return _TEMP_LABELS[temperature_code]
 
 
-def humidity_status(humidity_reading: float) -> str:
+def humidity_status(humidity_code: int) -> str:
     """Classify humidity reading."""
-    if humidity_reading < 30:
-        return "dry"
-    elif humidity_reading < 60:
-        return "normal"
-    else:
-        return "humid"
+    return _HUMIDITY_LABELS[humidity_code]
 
 
-def alert_conditions(temperature_status: str, humidity_status: str) -> Dict[str, bool]:
+def alert_conditions(temperature_code: int, humidity_code: int) -> Alerts:
     """Check for alert conditions."""
-    return {
-        "temperature_alert": temperature_status in ["freezing", "hot"],
-        "humidity_alert": humidity_status in ["dry", "humid"],
-        "combined_alert": (
-            temperature_status in ["freezing", "hot"] and 
-            humidity_status in ["dry", "humid"]
-        )
-    }
+    temperature_alert = bool(_TEMP_ALERT_MASK >> temperature_code & 1)
+    humidity_alert = bool(_HUMIDITY_ALERT_MASK >> humidity_code & 1)
+    return Alerts(
+        temperature_alert=temperature_alert,
+        humidity_alert=humidity_alert,
+        combined_alert=temperature_alert and humidity_alert
+    )
 
 
-def processed_data(
-    mqtt_metadata: Dict[str, str],
+def generate_response(
+    mqtt_metadata: Metadata,
     temperature_reading: float,
-    humidity_reading: float, 
+    humidity_reading: float,
     temperature_status: str,
     humidity_status: str,
-    alert_conditions: Dict[str, bool]
+    alert_conditions: Alerts,
+    execution_timestamp: str
 ) -> Dict[str, Any]:
-    """Combine all processed data."""
+    """Append the processed message to the log file and generate the response (final pipeline output)."""
+    topic = mqtt_metadata.topic
+
+    # Append log entry (one JSON object per line)
+    _write_log(msgspec.json.encode({
+        "ts": execution_timestamp,
+        "topic": topic,
+        "temperature": temperature_reading,
+        "temperature_status": temperature_status,
+        "humidity": humidity_reading,
+        "humidity_status": humidity_status,
+        "alerts": alert_conditions
+    }) + b"\n")
+
     return {
-        "metadata": mqtt_metadata,
-        "readings": {
-            "temperature": temperature_reading,
-            "humidity": humidity_reading
-        },
-        "status": {
-            "temperature": temperature_status,
-            "humidity": humidity_status
+        "success": True,
+        "message": f"Processed MQTT message from {topic}",
+        "data": {
+            "metadata": msgspec.to_builtins(mqtt_metadata),
+            "readings": {
+                "temperature": temperature_reading,
+                "humidity": humidity_reading
+            },
+            "status": {
+                "temperature": temperature_status,
+                "humidity": humidity_status
+            },
+            "alerts": msgspec.to_builtins(alert_conditions),
+            "processed_at": execution_timestamp
         },
-        "alerts": alert_conditions,
-        "processed_at": datetime.now().isoformat()
+        "summary": {
+            "temperature": f"{temperature_reading:.1f}°C ({temperature_status})",
+            "humidity": f"{humidity_reading:.1f}% ({humidity_status})",
+            "has_alerts": alert_conditions.temperature_alert or alert_conditions.humidity_alert
+        }
     }
 
 
-def save_to_log(processed_data: Dict[str, Any]) -> str:
-    """Save processed data to log file."""
-    log_file = Path("mqtt_processing.log")
-    
-    # Create log entry
-    log_entry = (
-        f"{processed_data['processed_at']} - "
-        f"Topic: {processed_data['metadata']['topic']} - "
-        f"Temp: {processed_data['readings']['temperature']:.1f}°C "
-        f"({processed_data['status']['temperature']}) - "
-        f"Humidity: {processed_data['readings']['humidity']:.1f}% "
-        f"({processed_data['status']['humidity']}) - "
-        f"Alerts: {processed_data['alerts']}\n"
-    )
-    
-    # Append to log file
-    with open(log_file, "a") as f:
-        f.write(log_entry)
-    
-    return f"Logged to {log_file}"
+# Thin aliases for the nodes generate_response absorbed, so pipeline configs
+# that still list them as final vars keep working.
 
+def processed_data(generate_response: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine all processed data."""
+    return generate_response["data"]
 
-def generate_response(processed_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate response data (final pipeline output)."""
-    return {
-        "success": True,
-        "message": f"Processed MQTT message from {processed_data['metadata']['topic']}",
-        "data": processed_data,
-        "summary": {
-            "temperature": f"{processed_data['readings']['temperature']:.1f}°C ({processed_data['status']['temperature']})",
-            "humidity": f"{processed_data['readings']['humidity']:.1f}% ({processed_data['status']['humidity']})",
-            "has_alerts": any(processed_data['alerts'].values())
-        }
-    }
+
+def save_to_log(generate_response: Dict[str, Any]) -> str:
+    """Save processed data to log file (written by ``generate_response``)."""
+    return _LOG_RESULT
 
 
 # Example usage in a pipeline configuration:
@@ -159,4 +244,4 @@ def generate_response(processed_data: Dict[str, Any]) -> Dict[str, Any]:
 # 
 # params: {}  # No additional parameters needed
 # 
-# schedule: {}  # No schedule needed (triggered by MQTT)
\ No newline at end of file
+# schedule: {}  # No schedule needed (triggered by MQTT)
@@ -0,0 +1,116 @@
+"""
+Shared demo runner for the asynchronous RQ example.
+
+Used by both ``async_with_rq.py`` and its marimo notebook so that the
+demo logic lives in a single place.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from flowerpower_mqtt import MQTTPlugin
+
+logger = logging.getLogger(__name__)
+
+# Subscriptions with different execution modes, sent in one SUBSCRIBE packet
+SUBSCRIPTIONS: List[Dict[str, Any]] = [
+    # High-volume data: process asynchronously
+    {
+        "topic": "sensors/+/data",
+        "pipeline": "sensor_data_processor",
+        "qos": 1,
+        "execution_mode": "async"
+    },
+    # Critical alerts: process synchronously
+    {
+        "topic": "alerts/critical",
+        "pipeline": "critical_alert_handler",
+        "qos": 2,
+        "execution_mode": "sync"
+    },
+    # Mixed mode: QoS-based routing
+    {
+        "topic": "mixed/topic",
+        "pipeline": "mixed_processor",
+        "qos": 1,
+        "execution_mode": "mixed"
+    },
+    # Factory monitoring
+    {
+        "topic": "factory/+/temperature",
+        "pipeline": "factory_temp_monitor",
+        "qos": 1,
+        "execution_mode": "async"
+    },
+    {
+        "topic": "factory/+/pressure",
+        "pipeline": "factory_pressure_monitor",
+        "qos": 1,
+        "execution_mode": "async"
+    }
+]
+
+
+def log_stats(mqtt: MQTTPlugin, stats: Dict[str, Any]) -> None:
+    """Log the plugin's message, pipeline and error counters."""
+    mqtt.fill_statistics(stats)
+    logger.info(
+        "Stats - Messages: %s, Pipelines: %s, Errors: %s",
+        stats["message_count"],
+        stats["pipeline_count"],
+        stats["error_count"],
+    )
+
+
+async def run_async_rq_demo(
+    mqtt: MQTTPlugin,
+    duration: int = 60,
+    stats_interval: int = 10
+) -> None:
+    """
+    Connect, subscribe and monitor the plugin for `duration` seconds, then shut down.
+
+    Statistics are logged from loop timers, so the event loop stays idle
+    between log lines.
+
+    Args:
+        mqtt: Plugin created with the job queue enabled
+        duration: Monitoring time in seconds
+        stats_interval: Seconds between statistics log lines
+    """
+    try:
+        # Connect to MQTT broker
+        logger.info("Connecting to MQTT broker with job queue enabled...")
+        await mqtt.connect()
+
+        await mqtt.subscribe_bulk(SUBSCRIPTIONS)
+
+        # Start listener in background
+        logger.info("Starting MQTT listener in background...")
+        await mqtt.start_listener(background=True)
+
+        # Monitor statistics
+        logger.info("Monitoring for %d seconds. Press Ctrl+C to stop early...", duration)
+        loop = asyncio.get_running_loop()
+        stats: Dict[str, Any] = {}  # Reused by every stats line
+        stats_timers = [
+            loop.call_later(delay, log_stats, mqtt, stats)
+            for delay in range(0, duration, stats_interval)
+        ]
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            for timer in stats_timers:
+                timer.cancel()
+
+    except KeyboardInterrupt:
+        logger.info("Received keyboard interrupt")
+    except Exception as e:
+        logger.error("Error: %s", e)
+    finally:
+        # Clean shutdown
+        logger.info("Stopping MQTT plugin...")
+        await mqtt.stop_listener(timeout=5.0)
+        await mqtt.disconnect()
+        logger.info("MQTT plugin stopped")
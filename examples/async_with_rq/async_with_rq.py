@@ -7,11 +7,22 @@ pipeline execution, allowing for scalable message processing.
 
 import asyncio
 import logging
+import sys
 from flowerpower_mqtt import MQTTPlugin
 
+# Shared demo logic lives in examples/_common/runners; run this example as a
+# module from the repository root (python -m examples.async_with_rq.async_with_rq)
+from examples._common.runners.async_with_rq_runner import run_async_rq_demo
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+
+# Startup notice, written to stdout in one call
+_BANNER = (
+    "Make sure to start an RQ worker before running this example:\n"
+    "rq worker mqtt_pipelines --url redis://localhost:6379\n"
+    "\n"
+)
 
 
 async def main():
@@ -27,91 +38,21 @@ async def main():
         client_id="flowerpower_async_example"
     )
     
-    try:
-        # Connect to MQTT broker
-        logger.info("Connecting to MQTT broker with job queue enabled...")
-        await mqtt.connect()
-        
-        # Subscribe with different execution modes
-        
-        # High-volume data: process asynchronously
-        await mqtt.subscribe(
-            topic="sensors/+/data", 
-            pipeline_name="sensor_data_processor",
-            qos=1,
-            execution_mode="async"
-        )
-        
-        # Critical alerts: process synchronously
-        await mqtt.subscribe(
-            topic="alerts/critical", 
-            pipeline_name="critical_alert_handler",
-            qos=2,
-            execution_mode="sync"
-        )
-        
-        # Mixed mode: QoS-based routing
-        await mqtt.subscribe(
-            topic="mixed/topic",
-            pipeline_name="mixed_processor",
-            qos=1,
-            execution_mode="mixed"
-        )
-        
-        # Bulk subscription example
-        bulk_subscriptions = [
-            {
-                "topic": "factory/+/temperature",
-                "pipeline": "factory_temp_monitor",
-                "qos": 1,
-                "execution_mode": "async"
-            },
-            {
-                "topic": "factory/+/pressure",
-                "pipeline": "factory_pressure_monitor", 
-                "qos": 1,
-                "execution_mode": "async"
-            }
-        ]
-        
-        await mqtt.subscribe_bulk(bulk_subscriptions)
-        
-        # Start listener in background
-        logger.info("Starting MQTT listener in background...")
-        await mqtt.start_listener(background=True)
-        
-        # Monitor statistics
-        logger.info("Monitoring for 60 seconds. Press Ctrl+C to stop early...")
-        for i in range(60):
-            await asyncio.sleep(1)
-            
-            if i % 10 == 0:  # Print stats every 10 seconds
-                stats = mqtt.get_statistics()
-                logger.info(
-                    f"Stats - Messages: {stats.get('message_count', 0)}, "
-                    f"Pipelines: {stats.get('pipeline_count', 0)}, "
-                    f"Errors: {stats.get('error_count', 0)}"
-                )
-        
-    except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt")
-    except Exception as e:
-        logger.error(f"Error: {e}")
-    finally:
-        # Clean shutdown
-        logger.info("Stopping MQTT plugin...")
-        await mqtt.stop_listener(timeout=5.0)
-        await mqtt.disconnect()
-        logger.info("MQTT plugin stopped")
+    await run_async_rq_demo(mqtt, duration=60)
 
 
 if __name__ == "__main__":
     # Note: Make sure to start an RQ worker in a separate terminal:
     # rq worker mqtt_pipelines --url redis://localhost:6379
     
-    print("Make sure to start an RQ worker before running this example:")
-    print("rq worker mqtt_pipelines --url redis://localhost:6379")
-    print()
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
     
-    # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    # Run the example on uvloop when it is installed (not available on Windows,
+    # where the default selector event loop is used instead)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -113,7 +113,7 @@ def _(mo):
         r"""
         ## Step 4: Subscribe with Different Execution Modes
 
-        Subscribe to topics with different execution modes to demonstrate various processing strategies.
+        Subscribe to topics with different execution modes to demonstrate various processing strategies. All topics are passed to a single bulk subscription, which sends them to the broker in one SUBSCRIBE packet.
         """
     )
     return
@@ -121,51 +121,29 @@ def _(mo):
 
 @app.cell
 async def _(logger, mqtt):
-    # High-volume sensor data: process asynchronously
-    await mqtt.subscribe(
-        topic="sensors/+/data", 
-        pipeline_name="sensor_data_processor",
-        qos=1,
-        execution_mode="async"  # Background processing
-    )
-    logger.info("Subscribed to sensor data topic (async mode)")
-
-    # Critical alerts: process synchronously
-    await mqtt.subscribe(
-        topic="alerts/critical", 
-        pipeline_name="critical_alert_handler",
-        qos=2,  # Highest QoS for critical data
-        execution_mode="sync"  # Immediate processing
-    )
-    logger.info("Subscribed to critical alerts topic (sync mode)")
-
-    # Mixed mode: QoS-based routing
-    await mqtt.subscribe(
-        topic="mixed/topic",
-        pipeline_name="mixed_processor",
-        qos=1,
-        execution_mode="mixed"  # QoS determines processing
-    )
-    logger.info("Subscribed to mixed topic (mixed mode)")
-    return
-
-
-@app.cell(hide_code=True)
-def _(mo):
-    mo.md(
-        r"""
-        ## Step 5: Bulk Subscription Example
-
-        Demonstrate subscribing to multiple topics at once using bulk subscription.
-        """
-    )
-    return
-
-
-@app.cell
-async def _(logger, mqtt):
-    # Bulk subscription for factory monitoring
-    bulk_subscriptions = [
+    subscriptions = [
+        # High-volume sensor data: process asynchronously
+        {
+            "topic": "sensors/+/data",
+            "pipeline": "sensor_data_processor",
+            "qos": 1,
+            "execution_mode": "async"  # Background processing
+        },
+        # Critical alerts: process synchronously
+        {
+            "topic": "alerts/critical",
+            "pipeline": "critical_alert_handler",
+            "qos": 2,  # Highest QoS for critical data
+            "execution_mode": "sync"  # Immediate processing
+        },
+        # Mixed mode: QoS-based routing
+        {
+            "topic": "mixed/topic",
+            "pipeline": "mixed_processor",
+            "qos": 1,
+            "execution_mode": "mixed"  # QoS determines processing
+        },
+        # Factory monitoring
         {
             "topic": "factory/+/temperature",
             "pipeline": "factory_temp_monitor",
@@ -174,14 +152,14 @@ async def _(logger, mqtt):
         },
         {
             "topic": "factory/+/pressure",
-            "pipeline": "factory_pressure_monitor", 
+            "pipeline": "factory_pressure_monitor",
             "qos": 1,
             "execution_mode": "async"
         }
     ]
 
-    await mqtt.subscribe_bulk(bulk_subscriptions)
-    logger.info(f"Bulk subscribed to {len(bulk_subscriptions)} factory topics")
+    await mqtt.subscribe_bulk(subscriptions)
+    logger.info("Subscribed to %d topics", len(subscriptions))
     return
 
 
@@ -189,7 +167,7 @@ async def _(logger, mqtt):
 def _(mo):
     mo.md(
         r"""
-        ## Step 6: Start Background Listener
+        ## Step 5: Start Background Listener
 
         Start the MQTT listener in background mode to continuously process messages.
         """
@@ -210,7 +188,7 @@ async def _(logger, mqtt):
 def _(mo):
     mo.md(
         r"""
-        ## Step 7: Monitor Processing Statistics
+        ## Step 6: Monitor Processing Statistics
 
         Monitor the processing statistics to see how messages are being handled.
         """
@@ -220,18 +198,26 @@ def _(mo):
 
 @app.cell
 async def _(asyncio, logger, mqtt):
-    # Monitor statistics for 60 seconds
+    _stats = {}  # Reused by every stats line
+
+    def _log_stats():
+        mqtt.fill_statistics(_stats)
+        logger.info(
+            "Stats - Messages: %s, Pipelines: %s, Errors: %s",
+            _stats["message_count"],
+            _stats["pipeline_count"],
+            _stats["error_count"],
+        )
+
+    # Monitor statistics for 60 seconds, logging them every 10 seconds from loop timers
     logger.info("Monitoring for 60 seconds. Press Ctrl+C to stop early...")
-    for i in range(60):
-        await asyncio.sleep(1)
-    
-        if i % 10 == 0:  # Print stats every 10 seconds
-            stats = mqtt.get_statistics()
-            logger.info(
-                f"Stats - Messages: {stats.get('message_count', 0)}, "
-                f"Pipelines: {stats.get('pipeline_count', 0)}, "
-                f"Errors: {stats.get('error_count', 0)}"
-            )
+    _loop = asyncio.get_running_loop()
+    _timers = [_loop.call_later(_delay, _log_stats) for _delay in range(0, 60, 10)]
+    try:
+        await asyncio.sleep(60)
+    finally:
+        for _timer in _timers:
+            _timer.cancel()
     return
 
 
@@ -239,7 +225,7 @@ async def _(asyncio, logger, mqtt):
 def _(mo):
     mo.md(
         r"""
-        ## Step 8: Clean Shutdown
+        ## Step 7: Clean Shutdown
 
         Properly stop the listener and disconnect from the broker.
         """
@@ -270,38 +256,15 @@ def _(mo):
 
 
 @app.cell
-def _(MQTTPlugin, asyncio, logging):
+def _(MQTTPlugin, logging):
+    # The complete example runs the same shared demo as async_with_rq.py
+    from examples._common.runners.async_with_rq_runner import run_async_rq_demo
     logging.basicConfig(level=logging.INFO)
-    logger_1 = logging.getLogger(__name__)
 
     async def main():
         """Asynchronous MQTT plugin usage with RQ job queue."""
         mqtt = MQTTPlugin(broker='localhost', port=1883, base_dir='.', use_job_queue=True, redis_url='redis://localhost:6379', client_id='flowerpower_async_example')
-        try:
-            logger_1.info('Connecting to MQTT broker with job queue enabled...')
-            await mqtt.connect()
-            await mqtt.subscribe(topic='sensors/+/data', pipeline_name='sensor_data_processor', qos=1, execution_mode='async')
-            await mqtt.subscribe(topic='alerts/critical', pipeline_name='critical_alert_handler', qos=2, execution_mode='sync')
-            await mqtt.subscribe(topic='mixed/topic', pipeline_name='mixed_processor', qos=1, execution_mode='mixed')
-            bulk_subscriptions = [{'topic': 'factory/+/temperature', 'pipeline': 'factory_temp_monitor', 'qos': 1, 'execution_mode': 'async'}, {'topic': 'factory/+/pressure', 'pipeline': 'factory_pressure_monitor', 'qos': 1, 'execution_mode': 'async'}]
-            await mqtt.subscribe_bulk(bulk_subscriptions)
-            logger_1.info('Starting MQTT listener in background...')
-            await mqtt.start_listener(background=True)
-            logger_1.info('Monitoring for 60 seconds. Press Ctrl+C to stop early...')
-            for i in range(60):
-                await asyncio.sleep(1)
-                if i % 10 == 0:
-                    stats = mqtt.get_statistics()
-                    logger_1.info(f"Stats - Messages: {stats.get('message_count', 0)}, Pipelines: {stats.get('pipeline_count', 0)}, Errors: {stats.get('error_count', 0)}")
-        except KeyboardInterrupt:
-            logger_1.info('Received keyboard interrupt')
-        except Exception as e:
-            logger_1.error(f'Error: {e}')
-        finally:
-            logger_1.info('Stopping MQTT plugin...')
-            await mqtt.stop_listener(timeout=5.0)
-            await mqtt.disconnect()
-            logger_1.info('MQTT plugin stopped')
+        await run_async_rq_demo(mqtt, duration=60)
     return
 
 
@@ -30,18 +30,19 @@ async def main():
         logger.info("Connecting to MQTT broker...")
         await mqtt.connect()
         
-        # Subscribe to topics
-        await mqtt.subscribe(
-            topic="sensors/temperature", 
-            pipeline_name="temperature_processor",
-            qos=1
-        )
-        
-        await mqtt.subscribe(
-            topic="sensors/humidity",
-            pipeline_name="humidity_processor", 
-            qos=0
-        )
+        # Subscribe to topics (single SUBSCRIBE packet for both)
+        await mqtt.subscribe_bulk([
+            {
+                "topic": "sensors/temperature",
+                "pipeline": "temperature_processor",
+                "qos": 1
+            },
+            {
+                "topic": "sensors/humidity",
+                "pipeline": "humidity_processor",
+                "qos": 0
+            }
+        ])
         
         # Start listening for messages (blocks until Ctrl+C)
         logger.info("Starting MQTT listener. Press Ctrl+C to stop...")
@@ -50,7 +51,7 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
     finally:
         # Clean shutdown
         logger.info("Stopping MQTT plugin...")
@@ -59,5 +60,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    # Run the example on uvloop when it is installed (not available on Windows,
+    # where the default selector event loop is used instead)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -116,21 +116,20 @@ def _(mo):
 
 @app.cell
 async def _(logger, mqtt):
-    # Subscribe to temperature sensor topic
-    await mqtt.subscribe(
-        topic="sensors/temperature", 
-        pipeline_name="temperature_processor",
-        qos=1  # At least once delivery
-    )
-    logger.info("Subscribed to temperature sensor topic")
-
-    # Subscribe to humidity sensor topic
-    await mqtt.subscribe(
-        topic="sensors/humidity",
-        pipeline_name="humidity_processor", 
-        qos=0  # Fire and forget
-    )
-    logger.info("Subscribed to humidity sensor topic")
+    # Subscribe to both sensor topics with a single SUBSCRIBE packet
+    await mqtt.subscribe_bulk([
+        {
+            "topic": "sensors/temperature",
+            "pipeline": "temperature_processor",
+            "qos": 1  # At least once delivery
+        },
+        {
+            "topic": "sensors/humidity",
+            "pipeline": "humidity_processor",
+            "qos": 0  # Fire and forget
+        }
+    ])
+    logger.info("Subscribed to temperature and humidity sensor topics")
     return
 
 
@@ -198,14 +197,13 @@ def _(MQTTPlugin, logging):
         try:
             logger_1.info('Connecting to MQTT broker...')
             await mqtt.connect()
-            await mqtt.subscribe(topic='sensors/temperature', pipeline_name='temperature_processor', qos=1)
-            await mqtt.subscribe(topic='sensors/humidity', pipeline_name='humidity_processor', qos=0)
+            await mqtt.subscribe_bulk([{'topic': 'sensors/temperature', 'pipeline': 'temperature_processor', 'qos': 1}, {'topic': 'sensors/humidity', 'pipeline': 'humidity_processor', 'qos': 0}])
             logger_1.info('Starting MQTT listener. Press Ctrl+C to stop...')
             await mqtt.start_listener(background=False)
         except KeyboardInterrupt:
             logger_1.info('Received keyboard interrupt')
         except Exception as e:
-            logger_1.error(f'Error: {e}')
+            logger_1.error('Error: %s', e)
         finally:
             logger_1.info('Stopping MQTT plugin...')
             await mqtt.disconnect()
@@ -8,94 +8,39 @@ for managing complex MQTT setups.
 import asyncio
 import logging
 from pathlib import Path
-from flowerpower_mqtt import MQTTPlugin, FlowerPowerMQTTConfig
+from flowerpower_mqtt import MQTTPlugin
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-def create_example_config():
-    """Create an example configuration file."""
-    
-    config = FlowerPowerMQTTConfig()
-    
-    # MQTT broker settings
-    config.mqtt.broker = "localhost"
-    config.mqtt.port = 1883
-    config.mqtt.keepalive = 60
-    config.mqtt.client_id = "flowerpower_config_example"
-    
-    # Job queue settings
-    config.job_queue.enabled = True
-    config.job_queue.redis_url = "redis://localhost:6379"
-    config.job_queue.queue_name = "mqtt_pipelines"
-    config.job_queue.worker_count = 4
-    
-    # Base directory
-    config.base_dir = "."
-    config.log_level = "INFO"
-    
-    # Predefined subscriptions
-    from flowerpower_mqtt.config import SubscriptionConfig
-    
-    config.subscriptions = [
-        SubscriptionConfig(
-            topic="sensors/+/temperature",
-            pipeline="temperature_processor",
-            qos=1,
-            execution_mode="async"
-        ),
-        SubscriptionConfig(
-            topic="sensors/+/humidity", 
-            pipeline="humidity_processor",
-            qos=1,
-            execution_mode="async"
-        ),
-        SubscriptionConfig(
-            topic="alerts/critical",
-            pipeline="critical_alert_handler",
-            qos=2,
-            execution_mode="sync"
-        ),
-        SubscriptionConfig(
-            topic="logs/+/error",
-            pipeline="error_log_processor", 
-            qos=0,
-            execution_mode="async"
-        )
-    ]
-    
-    # Save configuration
-    config_file = Path("example_mqtt_config.yml")
-    config.to_yaml(config_file)
-    logger.info(f"Created example configuration: {config_file}")
-    
-    return config_file
+# Example configuration shipped alongside this script
+EXAMPLE_CONFIG_FILE = Path(__file__).with_name("example_mqtt_config.yml")
 
 
 async def main():
     """Configuration-based MQTT plugin usage."""
     
-    # Create example configuration file
-    config_file = create_example_config()
-    
     try:
         # Load plugin from configuration
-        logger.info(f"Loading plugin from configuration: {config_file}")
-        mqtt = MQTTPlugin.from_config(config_file)
+        logger.info("Loading plugin from configuration: %s", EXAMPLE_CONFIG_FILE)
+        mqtt = MQTTPlugin.from_config(EXAMPLE_CONFIG_FILE)
         
         # Connect to MQTT broker
         logger.info("Connecting to MQTT broker...")
         await mqtt.connect()
         
-        # Display loaded subscriptions
-        subscriptions = mqtt.get_subscriptions()
-        logger.info(f"Loaded {len(subscriptions)} subscriptions from config:")
-        for sub in subscriptions:
+        # Display loaded subscriptions as a single log record
+        if logger.isEnabledFor(logging.INFO):
+            subscriptions = mqtt.get_subscriptions()
             logger.info(
-                f"  - {sub['topic']} -> {sub['pipeline']} "
-                f"(QoS {sub['qos']}, {sub['execution_mode']} mode)"
+                "Loaded %d subscriptions from config:\n%s",
+                len(subscriptions),
+                "\n".join(
+                    f"  - {sub['topic']} -> {sub['pipeline']} "
+                    f"(QoS {sub['qos']}, {sub['execution_mode']} mode)"
+                    for sub in subscriptions
+                ),
             )
         
         # You can still add more subscriptions programmatically
@@ -113,7 +58,7 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
     finally:
         # Clean shutdown
         logger.info("Stopping MQTT plugin...")
@@ -123,16 +68,17 @@ async def main():
             # Save final configuration (including runtime additions)
             final_config_file = Path("final_mqtt_config.yml") 
             mqtt.save_config(final_config_file)
-            logger.info(f"Saved final configuration: {final_config_file}")
-        
-        # Cleanup example config file
-        if config_file.exists():
-            config_file.unlink()
-            logger.info(f"Cleaned up example config: {config_file}")
+            logger.info("Saved final configuration: %s", final_config_file)
             
         logger.info("MQTT plugin stopped")
 
 
 if __name__ == "__main__":
-    # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    # Run the example on uvloop when it is installed (not available on Windows,
+    # where the default selector event loop is used instead)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
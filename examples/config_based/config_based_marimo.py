@@ -15,7 +15,7 @@ def _(mo):
         ## Overview
 
         This example shows how to:
-        - Create configuration files programmatically
+        - Ship a configuration file alongside the application
         - Load plugins from configuration files
         - Manage complex subscription setups
         - Save runtime configuration changes
@@ -39,6 +39,8 @@ def _(mo):
         ## Step 1: Import Required Libraries
 
         Import the necessary libraries for configuration-based MQTT setup.
+
+        The notebook runs on the kernel's event loop. For higher message throughput outside a notebook, run `config_based.py`, which uses uvloop when the `uvloop` extra is installed.
         """
     )
     return
@@ -49,49 +51,30 @@ def _():
     import asyncio
     import logging
     from pathlib import Path
-    from flowerpower_mqtt import MQTTPlugin, FlowerPowerMQTTConfig
+    from flowerpower_mqtt import MQTTPlugin
 
     # Configure logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
-    return FlowerPowerMQTTConfig, MQTTPlugin, Path, logger, logging
+    return MQTTPlugin, Path, logger, logging
 
 
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(
         r"""
-        ## Step 2: Create Configuration Programmatically
+        ## Step 2: Locate the Example Configuration
 
-        Create a comprehensive configuration file with MQTT settings, job queue configuration, and predefined subscriptions.
+        The example configuration ships as `example_mqtt_config.yml` next to this notebook. It contains the MQTT settings, the job queue configuration and the predefined subscriptions.
         """
     )
     return
 
 
 @app.cell
-def _(FlowerPowerMQTTConfig, Path, logger):
-    def _create_example_config():
-        """Create an example configuration file."""
-        config = FlowerPowerMQTTConfig()
-        config.mqtt.broker = 'localhost'
-        config.mqtt.port = 1883
-        config.mqtt.keepalive = 60
-        config.mqtt.client_id = 'flowerpower_config_example'
-        config.job_queue.enabled = True
-        config.job_queue.redis_url = 'redis://localhost:6379'
-        config.job_queue.queue_name = 'mqtt_pipelines'
-        config.job_queue.worker_count = 4
-        config.base_dir = '.'
-        config.log_level = 'INFO'
-        from flowerpower_mqtt.config import SubscriptionConfig
-        config.subscriptions = [SubscriptionConfig(topic='sensors/+/temperature', pipeline='temperature_processor', qos=1, execution_mode='async'), SubscriptionConfig(topic='sensors/+/humidity', pipeline='humidity_processor', qos=1, execution_mode='async'), SubscriptionConfig(topic='alerts/critical', pipeline='critical_alert_handler', qos=2, execution_mode='sync'), SubscriptionConfig(topic='logs/+/error', pipeline='error_log_processor', qos=0, execution_mode='async')]
-        config_file = Path('example_mqtt_config.yml')
-        config.to_yaml(config_file)
-        logger.info(f'Created example configuration: {config_file}')
-        return config_file
-    config_file = _create_example_config()
-    print(f'Configuration file created: {config_file}')
+def _(Path):
+    config_file = Path(__file__).with_name("example_mqtt_config.yml")
+    print(config_file.read_text())
     return (config_file,)
 
 
@@ -101,7 +84,7 @@ def _(mo):
         r"""
         ## Step 3: Load Plugin from Configuration
 
-        Load the MQTT plugin using the configuration file we just created.
+        Load the MQTT plugin using the example configuration file.
         """
     )
     return
@@ -109,9 +92,9 @@ def _(mo):
 
 @app.cell
 def _(MQTTPlugin, config_file, logger):
-    # Load plugin from configuration
-    logger.info(f"Loading plugin from configuration: {config_file}")
-    mqtt = MQTTPlugin.from_config(config_file)
+    # Load plugin from configuration; re-running this cell keeps the same plugin
+    logger.info("Loading plugin from configuration: %s", config_file)
+    mqtt = MQTTPlugin.from_config(config_file, reuse=True)
     logger.info("Plugin loaded successfully from configuration!")
     return (mqtt,)
 
@@ -150,14 +133,18 @@ def _(mo):
 
 
 @app.cell
-def _(logger, mqtt):
-    # Display loaded subscriptions
-    subscriptions = mqtt.get_subscriptions()
-    logger.info(f"Loaded {len(subscriptions)} subscriptions from config:")
-    for sub in subscriptions:
+def _(logger, logging, mqtt):
+    # Display loaded subscriptions as a single log record
+    if logger.isEnabledFor(logging.INFO):
+        _subscriptions = mqtt.get_subscriptions()
         logger.info(
-            f"  - {sub['topic']} -> {sub['pipeline']} "
-            f"(QoS {sub['qos']}, {sub['execution_mode']} mode)"
+            "Loaded %d subscriptions from config:\n%s",
+            len(_subscriptions),
+            "\n".join(
+                f"  - {_sub['topic']} -> {_sub['pipeline']} "
+                f"(QoS {_sub['qos']}, {_sub['execution_mode']} mode)"
+                for _sub in _subscriptions
+            ),
         )
     return
 
@@ -193,7 +180,7 @@ def _(mo):
         r"""
         ## Step 7: Start MQTT Listener
 
-        Start listening for MQTT messages using the configured subscriptions.
+        Start listening for MQTT messages using the configured subscriptions. The listener runs as a background task, so the following cells (saving the configuration, shutdown) can run while messages are being processed.
         """
     )
     return
@@ -201,9 +188,10 @@ def _(mo):
 
 @app.cell
 async def _(logger, mqtt):
-    # Start listener
-    logger.info("Starting MQTT listener. Press Ctrl+C to stop...")
-    await mqtt.start_listener(background=False)
+    # Start listener in the background; the cell returns once the listen loop is scheduled
+    logger.info("Starting MQTT listener in background...")
+    await mqtt.start_listener(background=True)
+    logger.info("Background listener started!")
     return
 
 
@@ -224,7 +212,7 @@ def _(Path, logger, mqtt):
     # Save final configuration (including runtime additions)
     final_config_file = Path("final_mqtt_config.yml") 
     mqtt.save_config(final_config_file)
-    logger.info(f"Saved final configuration: {final_config_file}")
+    logger.info("Saved final configuration: %s", final_config_file)
     return
 
 
@@ -241,16 +229,11 @@ def _(mo):
 
 
 @app.cell
-async def _(config_file, logger, mqtt):
+async def _(logger, mqtt):
     # Clean shutdown
     logger.info("Stopping MQTT plugin...")
     await mqtt.disconnect()
     logger.info("MQTT plugin stopped")
-
-    # Cleanup example config file
-    if config_file.exists():
-        config_file.unlink()
-        logger.info(f"Cleaned up example config: {config_file}")
     return
 
 
@@ -267,59 +250,35 @@ def _(mo):
 
 
 @app.cell
-def _(FlowerPowerMQTTConfig, MQTTPlugin, Path, SubscriptionConfig, logging):
-    logging.basicConfig(level=logging.INFO)
-    logger_1 = logging.getLogger(__name__)
-
-    def _create_example_config():
-        """Create an example configuration file."""
-        config = FlowerPowerMQTTConfig()
-        config.mqtt.broker = 'localhost'
-        config.mqtt.port = 1883
-        config.mqtt.keepalive = 60
-        config.mqtt.client_id = 'flowerpower_config_example'
-        config.job_queue.enabled = True
-        config.job_queue.redis_url = 'redis://localhost:6379'
-        config.job_queue.queue_name = 'mqtt_pipelines'
-        config.job_queue.worker_count = 4
-        config.base_dir = '.'
-        config.log_level = 'INFO'
-        config.subscriptions = [SubscriptionConfig(topic='sensors/+/temperature', pipeline='temperature_processor', qos=1, execution_mode='async'), SubscriptionConfig(topic='sensors/+/humidity', pipeline='humidity_processor', qos=1, execution_mode='async'), SubscriptionConfig(topic='alerts/critical', pipeline='critical_alert_handler', qos=2, execution_mode='sync'), SubscriptionConfig(topic='logs/+/error', pipeline='error_log_processor', qos=0, execution_mode='async')]
-        config_file = Path('example_mqtt_config.yml')
-        config.to_yaml(config_file)
-        logger_1.info(f'Created example configuration: {config_file}')
-        return config_file
+def _(MQTTPlugin, Path, logger, logging):
+    # Logging is configured once in the import cell
+    example_config_file = Path(__file__).with_name('example_mqtt_config.yml')
 
     async def main():
         """Configuration-based MQTT plugin usage."""
-        config_file = _create_example_config()
         try:
-            logger_1.info(f'Loading plugin from configuration: {config_file}')
-            mqtt = MQTTPlugin.from_config(config_file)
-            logger_1.info('Connecting to MQTT broker...')
+            logger.info('Loading plugin from configuration: %s', example_config_file)
+            mqtt = MQTTPlugin.from_config(example_config_file)
+            logger.info('Connecting to MQTT broker...')
             await mqtt.connect()
-            subscriptions = mqtt.get_subscriptions()
-            logger_1.info(f'Loaded {len(subscriptions)} subscriptions from config:')
-            for sub in subscriptions:
-                logger_1.info(f"  - {sub['topic']} -> {sub['pipeline']} (QoS {sub['qos']}, {sub['execution_mode']} mode)")
+            if logger.isEnabledFor(logging.INFO):
+                subscriptions = mqtt.get_subscriptions()
+                logger.info('Loaded %d subscriptions from config:\n%s', len(subscriptions), '\n'.join((f"  - {sub['topic']} -> {sub['pipeline']} (QoS {sub['qos']}, {sub['execution_mode']} mode)" for sub in subscriptions)))
             await mqtt.subscribe(topic='runtime/+/data', pipeline_name='runtime_processor', qos=1, execution_mode='async')
-            logger_1.info('Starting MQTT listener. Press Ctrl+C to stop...')
+            logger.info('Starting MQTT listener. Press Ctrl+C to stop...')
             await mqtt.start_listener(background=False)
         except KeyboardInterrupt:
-            logger_1.info('Received keyboard interrupt')
+            logger.info('Received keyboard interrupt')
         except Exception as e:
-            logger_1.error(f'Error: {e}')
+            logger.error('Error: %s', e)
         finally:
-            logger_1.info('Stopping MQTT plugin...')
+            logger.info('Stopping MQTT plugin...')
             if 'mqtt' in locals():
                 await mqtt.disconnect()
                 final_config_file = Path('final_mqtt_config.yml')
                 mqtt.save_config(final_config_file)
-                logger_1.info(f'Saved final configuration: {final_config_file}')
-            if config_file.exists():
-                config_file.unlink()
-                logger_1.info(f'Cleaned up example config: {config_file}')
-            logger_1.info('MQTT plugin stopped')
+                logger.info('Saved final configuration: %s', final_config_file)
+            logger.info('MQTT plugin stopped')
     return
 
 
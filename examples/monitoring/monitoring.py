@@ -7,14 +7,56 @@ track statistics, and manage subscriptions dynamically.
 
 import asyncio
 import logging
-import json
+import sys
+import time
 from datetime import datetime
+
+import msgspec
 from flowerpower_mqtt import MQTTPlugin
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Startup notice, written to stdout in one call
+_BANNER = (
+    "This example demonstrates monitoring and statistics collection.\n"
+    "It will show real-time statistics every 5 seconds and detailed\n"
+    "subscription information every 15 seconds.\n"
+    "\n"
+)
+
+# Per-tick statistics block, rendered with str.format_map
+_STATS_TEMPLATE = (
+    "=== MQTT Plugin Statistics ===\n"
+    "Connected: {connected}\n"
+    "Running: {running}\n"
+    "Runtime: {runtime_seconds:.1f}s\n"
+    "Messages: {message_count}\n"
+    "Pipelines: {pipeline_count}\n"
+    "Errors: {error_count}\n"
+    "Subscriptions: {subscriptions_count}"
+)
+_RATES_TEMPLATE = "\nMessage rate: {:.2f} msg/s\nPipeline rate: {:.2f} exec/s"
+_STATS_DEFAULTS = {
+    'connected': False,
+    'running': False,
+    'runtime_seconds': 0,
+    'message_count': 0,
+    'pipeline_count': 0,
+    'error_count': 0,
+    'subscriptions_count': 0,
+}
+
+# Test subscriptions as (topic, pipeline, qos, execution_mode)
+_SUBSCRIPTIONS = (
+    ("test/messages/+", "test_processor", 0, "async"),
+    ("sensors/+/data", "sensor_processor", 1, "async"),
+    ("alerts/+", "alert_processor", 2, "sync"),
+    ("logs/+/info", "log_processor", 0, "async"),
+    ("events/+/user", "user_event_processor", 1, "mixed"),
+)
+
 
 class MQTTMonitor:
     """Helper class for monitoring MQTT plugin statistics."""
@@ -23,113 +65,179 @@ class MQTTMonitor:
         self.mqtt_plugin = mqtt_plugin
         self.interval = interval
         self.monitoring = False
-        self.monitor_task = None
-        self.stats_history = []
+        self._loop = None
+        self._handle = None  # Pending call_later timer for the next tick
+        self._get_stats = None
+        
+        # Each tick is appended to a JSONL file as it is collected instead
+        # of being held in memory; only the latest tick is kept for the summary
+        self.history_path = None
+        self._history_file = None
+        self._encoder = msgspec.json.Encoder()
+        self._latest = None
+        self._ticks = 0
+        self._last_counters = None  # Counters in the last history row
+        
+        # Counters at the previous tick and exponentially weighted rates;
+        # rates stay None until two ticks have been seen
+        self._prev_msg = 0
+        self._prev_pipe = 0
+        self._prev_ns = None
+        self._alpha = 0.2
+        self._msg_rate = None
+        self._pipe_rate = None
     
     async def start_monitoring(self):
-        """Start background monitoring task."""
+        """Start background monitoring."""
         if self.monitoring:
             return
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.history_path = f"mqtt_stats_{timestamp}.jsonl"
+        self._history_file = open(self.history_path, 'ab', buffering=1 << 16)
             
         self.monitoring = True
-        self.monitor_task = asyncio.create_task(self._monitor_loop())
-        logger.info(f"Started monitoring with {self.interval}s interval")
+        # A timer callback per tick rather than a long-lived sleeping task
+        self._loop = asyncio.get_running_loop()
+        self._get_stats = self.mqtt_plugin.get_statistics  # Bound once, called every tick
+        self._handle = self._loop.call_later(self.interval, self._tick)
+        
+        # Broker and job queue settings are fixed for the connection; log them
+        # once here rather than on every tick
+        stats = self.mqtt_plugin.get_statistics()
+        logger.info(
+            "Started monitoring with %ss interval (broker: %s, job queue: %s)",
+            self.interval, stats.get('broker', 'N/A'), stats.get('job_queue_enabled', False),
+        )
     
     async def stop_monitoring(self):
-        """Stop background monitoring task."""
+        """Stop background monitoring."""
         if not self.monitoring:
             return
-            
+        
         self.monitoring = False
-        if self.monitor_task:
-            self.monitor_task.cancel()
-            try:
-                await self.monitor_task
-            except asyncio.CancelledError:
-                pass
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        
+        if self._history_file:
+            self._history_file.close()
+            self._history_file = None
         
         logger.info("Stopped monitoring")
     
-    async def _monitor_loop(self):
-        """Main monitoring loop."""
-        try:
-            while self.monitoring:
-                await asyncio.sleep(self.interval)
-                
-                if not self.monitoring:
-                    break
-                    
-                # Collect current statistics
-                stats = self.mqtt_plugin.get_statistics()
-                stats['timestamp'] = datetime.now().isoformat()
-                
-                # Store in history
-                self.stats_history.append(stats)
-                
-                # Keep only last 100 entries
-                if len(self.stats_history) > 100:
-                    self.stats_history.pop(0)
-                
-                # Log current stats
-                self._log_stats(stats)
-                
-        except asyncio.CancelledError:
-            logger.info("Monitor loop cancelled")
+    def _tick(self):
+        """Collect, record and log one round of statistics."""
+        if not self.monitoring:
+            return
+        
+        # Schedule the next tick first so it keeps its cadence even if this one fails
+        self._handle = self._loop.call_later(self.interval, self._tick)
+        
+        # Collect current statistics
+        stats = self._get_stats()
+        now = time.perf_counter_ns()  # Integer ns for rates; not saved
+        message_count = stats.get('message_count', 0)
+        pipeline_count = stats.get('pipeline_count', 0)
+        error_count = stats.get('error_count', 0)
+        self._update_rates(message_count, pipeline_count, now)
+        
+        # Stream a compact row to the history file, one JSON object per line;
+        # the full snapshot is only kept in memory for the summary. Idle ticks
+        # add no row, so a gap between epochs means the counters held steady
+        counters = (message_count, pipeline_count, error_count)
+        if counters != self._last_counters:
+            self._last_counters = counters
+            self._history_file.write(self._encoder.encode({
+                'epoch': time.time(),  # Formatted by readers of the history file
+                'message_count': message_count,
+                'pipeline_count': pipeline_count,
+                'error_count': error_count,
+                'message_rate': self._msg_rate,
+                'pipeline_rate': self._pipe_rate,
+            }) + b"\n")
+        self._latest = stats
+        self._ticks += 1
+        
+        # Log current stats
+        self._log_stats(stats)
+    
+    def _update_rates(self, message_count, pipeline_count, now):
+        """Fold the counter deltas since the previous tick into the smoothed rates."""
+        if self._prev_ns is not None:
+            time_diff = (now - self._prev_ns) / 1_000_000_000
+        
+            if time_diff > 0:
+                msg_rate = (message_count - self._prev_msg) / time_diff
+                pipe_rate = (pipeline_count - self._prev_pipe) / time_diff
+                if self._msg_rate is None:
+                    self._msg_rate, self._pipe_rate = msg_rate, pipe_rate
+                else:
+                    alpha = self._alpha
+                    self._msg_rate += alpha * (msg_rate - self._msg_rate)
+                    self._pipe_rate += alpha * (pipe_rate - self._pipe_rate)
+        
+        self._prev_msg = message_count
+        self._prev_pipe = pipeline_count
+        self._prev_ns = now
     
     def _log_stats(self, stats):
         """Log current statistics."""
-        logger.info("=== MQTT Plugin Statistics ===")
-        logger.info(f"Connected: {stats.get('connected', False)}")
-        logger.info(f"Broker: {stats.get('broker', 'N/A')}")
-        logger.info(f"Running: {stats.get('running', False)}")
-        logger.info(f"Runtime: {stats.get('runtime_seconds', 0):.1f}s")
-        logger.info(f"Messages: {stats.get('message_count', 0)}")
-        logger.info(f"Pipelines: {stats.get('pipeline_count', 0)}")
-        logger.info(f"Errors: {stats.get('error_count', 0)}")
-        logger.info(f"Subscriptions: {stats.get('subscriptions_count', 0)}")
-        logger.info(f"Job Queue: {stats.get('job_queue_enabled', False)}")
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
-        # Calculate rates if we have history
-        if len(self.stats_history) >= 2:
-            prev_stats = self.stats_history[-2]
-            time_diff = (
-                datetime.fromisoformat(stats['timestamp']) - 
-                datetime.fromisoformat(prev_stats['timestamp'])
-            ).total_seconds()
-            
-            if time_diff > 0:
-                msg_rate = (
-                    stats.get('message_count', 0) - 
-                    prev_stats.get('message_count', 0)
-                ) / time_diff
-                
-                pipe_rate = (
-                    stats.get('pipeline_count', 0) - 
-                    prev_stats.get('pipeline_count', 0)
-                ) / time_diff
-                
-                logger.info(f"Message rate: {msg_rate:.2f} msg/s")
-                logger.info(f"Pipeline rate: {pipe_rate:.2f} exec/s")
+        # Fill the prebuilt template in one pass, with defaults for missing fields
+        text = _STATS_TEMPLATE.format_map({**_STATS_DEFAULTS, **stats})
+        if self._msg_rate is not None:
+            text += _RATES_TEMPLATE.format(self._msg_rate, self._pipe_rate)
         
-        logger.info("=" * 30)
+        # One log record per tick instead of one per line
+        logger.info("%s\n%s", text, "=" * 30)
     
     def get_summary(self):
         """Get monitoring summary."""
-        if not self.stats_history:
+        if self._latest is None:
             return {"message": "No statistics available"}
         
-        latest = self.stats_history[-1]
+        latest = self._latest
+        message_count = latest.get('message_count', 0)
+        error_count = latest.get('error_count', 0)
+        runtime = latest.get('runtime_seconds', 0)
         return {
-            "monitoring_duration": len(self.stats_history) * self.interval,
-            "total_messages": latest.get('message_count', 0),
+            "monitoring_duration": self._ticks * self.interval,
+            "total_messages": message_count,
             "total_pipelines": latest.get('pipeline_count', 0),
-            "total_errors": latest.get('error_count', 0),
-            "average_message_rate": latest.get('message_count', 0) / max(latest.get('runtime_seconds', 1), 1),
-            "error_rate": latest.get('error_count', 0) / max(latest.get('message_count', 1), 1),
-            "uptime": latest.get('runtime_seconds', 0)
+            "total_errors": error_count,
+            "average_message_rate": message_count / max(runtime, 1),
+            "error_rate": error_count / max(message_count, 1),
+            "uptime": runtime
         }
 
 
+async def log_subscription_details(mqtt: MQTTPlugin, stop: asyncio.Event, interval: int = 15):
+    """Log per-subscription statistics every interval seconds until stop is set."""
+    while True:
+        # Wake early and return cleanly once stop is set
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+            return
+        except TimeoutError:
+            pass
+        
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["=== Subscription Details ==="]
+            lines.extend(
+                f"  {sub['topic']}: "
+                f"{sub.get('message_count', 0)} messages, "
+                f"{sub.get('error_count', 0)} errors, "
+                f"QoS {sub['qos']}, "
+                f"{sub['execution_mode']} mode"
+                for sub in mqtt.get_subscriptions()
+            )
+            lines.append("=" * 28)
+            logger.info("\n".join(lines))
+
+
 async def main():
     """Monitoring and statistics example."""
     
@@ -151,22 +259,13 @@ async def main():
         logger.info("Connecting to MQTT broker...")
         await mqtt.connect()
         
-        # Set up various subscriptions for testing
-        subscriptions = [
-            ("test/messages/+", "test_processor", 0, "async"),
-            ("sensors/+/data", "sensor_processor", 1, "async"), 
-            ("alerts/+", "alert_processor", 2, "sync"),
-            ("logs/+/info", "log_processor", 0, "async"),
-            ("events/+/user", "user_event_processor", 1, "mixed")
-        ]
-        
-        for topic, pipeline, qos, mode in subscriptions:
-            await mqtt.subscribe(topic, pipeline, qos, mode)
-            logger.info(f"Subscribed: {topic} -> {pipeline} (QoS {qos}, {mode})")
+        # One SUBSCRIBE packet for all test topics
+        await mqtt.subscribe_bulk(_SUBSCRIPTIONS)
+        logger.info("Subscribed to %d topics", len(_SUBSCRIPTIONS))
         
         # Display initial subscription information
         subs = mqtt.get_subscriptions()
-        logger.info(f"Total subscriptions: {len(subs)}")
+        logger.info("Total subscriptions: %s", len(subs))
         
         # Start monitoring
         await monitor.start_monitoring()
@@ -178,41 +277,35 @@ async def main():
         # Simulate some dynamic subscription management
         logger.info("Running monitoring example for 60 seconds...")
         
-        for i in range(60):
-            await asyncio.sleep(1)
-            
-            # Add/remove subscriptions dynamically for testing
-            if i == 20:
-                logger.info("Adding dynamic subscription...")
-                await mqtt.subscribe(
-                    "dynamic/test/+", 
-                    "dynamic_processor", 
-                    qos=1, 
-                    execution_mode="async"
-                )
+        # Show detailed subscription stats every 15 seconds
+        details_stop = asyncio.Event()
+        details_task = asyncio.create_task(log_subscription_details(mqtt, details_stop))
+        
+        # Add/remove subscriptions dynamically for testing, sleeping
+        # straight through to each scheduled step
+        try:
+            await asyncio.sleep(20)
+            logger.info("Adding dynamic subscription...")
+            await mqtt.subscribe(
+                "dynamic/test/+", 
+                "dynamic_processor", 
+                qos=1, 
+                execution_mode="async"
+            )
             
-            elif i == 40:
-                logger.info("Removing dynamic subscription...")
-                await mqtt.unsubscribe("dynamic/test/+")
+            await asyncio.sleep(20)
+            logger.info("Removing dynamic subscription...")
+            await mqtt.unsubscribe("dynamic/test/+")
             
-            # Show detailed subscription stats every 15 seconds
-            if i % 15 == 0 and i > 0:
-                logger.info("=== Subscription Details ===")
-                current_subs = mqtt.get_subscriptions()
-                for sub in current_subs:
-                    logger.info(
-                        f"  {sub['topic']}: "
-                        f"{sub.get('message_count', 0)} messages, "
-                        f"{sub.get('error_count', 0)} errors, "
-                        f"QoS {sub['qos']}, "
-                        f"{sub['execution_mode']} mode"
-                    )
-                logger.info("=" * 28)
+            await asyncio.sleep(20)
+        finally:
+            details_stop.set()
+            await details_task
         
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
     finally:
         # Clean shutdown with detailed final statistics
         logger.info("Stopping monitoring and MQTT plugin...")
@@ -223,40 +316,43 @@ async def main():
         # Show monitoring summary
         summary = monitor.get_summary()
         logger.info("=== Monitoring Summary ===")
-        logger.info(f"Monitoring duration: {summary.get('monitoring_duration', 0)}s")
-        logger.info(f"Total messages: {summary.get('total_messages', 0)}")
-        logger.info(f"Total pipeline executions: {summary.get('total_pipelines', 0)}")
-        logger.info(f"Total errors: {summary.get('total_errors', 0)}")
-        logger.info(f"Average message rate: {summary.get('average_message_rate', 0):.2f} msg/s")
-        logger.info(f"Error rate: {summary.get('error_rate', 0):.4f}")
-        logger.info(f"Total uptime: {summary.get('uptime', 0):.1f}s")
+        logger.info("Monitoring duration: %ss", summary.get('monitoring_duration', 0))
+        logger.info("Total messages: %s", summary.get('total_messages', 0))
+        logger.info("Total pipeline executions: %s", summary.get('total_pipelines', 0))
+        logger.info("Total errors: %s", summary.get('total_errors', 0))
+        logger.info("Average message rate: %.2f msg/s", summary.get('average_message_rate', 0))
+        logger.info("Error rate: %.4f", summary.get('error_rate', 0))
+        logger.info("Total uptime: %.1fs", summary.get('uptime', 0))
         logger.info("=" * 26)
         
         # Stop MQTT plugin
         await mqtt.stop_listener(timeout=5.0)
         await mqtt.disconnect()
         
-        # Save monitoring data to file
-        if monitor.stats_history:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"mqtt_stats_{timestamp}.json"
+        # The per-tick history was streamed to JSONL while monitoring;
+        # only the summary is left to save
+        if monitor.history_path:
+            filename = monitor.history_path.replace('.jsonl', '_summary.json')
             
-            with open(filename, 'w') as f:
-                json.dump({
-                    'summary': summary,
-                    'stats_history': monitor.stats_history
-                }, f, indent=2)
+            # msgspec (a flowerpower-mqtt dependency) encodes in C
+            data = msgspec.json.encode(summary)
+            with open(filename, 'wb') as f:
+                f.write(msgspec.json.format(data, indent=2))
             
-            logger.info(f"Monitoring data saved to: {filename}")
+            logger.info("Monitoring data saved to: %s, %s", monitor.history_path, filename)
         
         logger.info("MQTT plugin stopped")
 
 
 if __name__ == "__main__":
-    print("This example demonstrates monitoring and statistics collection.")
-    print("It will show real-time statistics every 5 seconds and detailed")
-    print("subscription information every 15 seconds.")
-    print()
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
     
-    # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    # Run the example on uvloop when it is installed (not available on Windows,
+    # where the default selector event loop is used instead)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -7,12 +7,92 @@ for different types of messages and use cases.
 
 import asyncio
 import logging
+import sys
 from flowerpower_mqtt import MQTTPlugin
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# QoS guide shown at startup, written to stdout in one call
+_BANNER = (
+    "QoS Level Guide:\n"
+    "QoS 0: Fire-and-forget - Fast, no delivery guarantee\n"
+    "QoS 1: At-least-once - Reliable, may get duplicates\n"
+    "QoS 2: Exactly-once - Reliable, no duplicates (slower)\n"
+    "\n"
+)
+
+# Subscriptions used by this example. They never change, so the table is
+# built once at import rather than on every call to main()
+_SUBSCRIPTIONS = (
+    # QoS 0: Fire-and-forget (best for high-volume, non-critical data)
+    # Use for: Debug logs, non-critical telemetry, high-frequency sensor data
+    {
+        "topic": "logs/debug/+",
+        "pipeline": "debug_log_processor",
+        "qos": 0,  # At most once delivery
+        "execution_mode": "async"  # Process in background
+    },
+    {
+        "topic": "telemetry/+/heartbeat",
+        "pipeline": "heartbeat_processor",
+        "qos": 0,  # Fire-and-forget for frequent heartbeats
+        "execution_mode": "async"
+    },
+
+    # QoS 1: At-least-once delivery (good for important events)
+    # Use for: Business events, important sensor readings, user actions
+    {
+        "topic": "sensors/+/temperature",
+        "pipeline": "temperature_processor",
+        "qos": 1,  # At least once delivery
+        "execution_mode": "async"
+    },
+    {
+        "topic": "events/user/+/login",
+        "pipeline": "user_login_processor",
+        "qos": 1,  # Important user events
+        "execution_mode": "async"
+    },
+    {
+        "topic": "orders/+/created",
+        "pipeline": "order_created_processor",
+        "qos": 1,  # Business-critical events
+        "execution_mode": "async"
+    },
+
+    # QoS 2: Exactly-once delivery (critical business processes)
+    # Use for: Financial transactions, critical alerts, regulatory data
+    {
+        "topic": "payments/+/completed",
+        "pipeline": "payment_completion_processor",
+        "qos": 2,  # Exactly once for financial data
+        "execution_mode": "sync"  # Process immediately
+    },
+    {
+        "topic": "alerts/critical/+",
+        "pipeline": "critical_alert_handler",
+        "qos": 2,  # Critical alerts must be processed
+        "execution_mode": "sync"  # Immediate processing
+    },
+    {
+        "topic": "compliance/audit/+",
+        "pipeline": "audit_log_processor",
+        "qos": 2,  # Regulatory compliance data
+        "execution_mode": "sync"
+    },
+
+    # Mixed mode: Let QoS level determine execution mode
+    # QoS 2 -> sync, QoS 0/1 -> async
+    {
+        "topic": "mixed/data/+",
+        "pipeline": "mixed_data_processor",
+        "qos": 1,  # Will be processed async due to mixed mode
+        "execution_mode": "mixed"
+    }
+)
+
 
 async def main():
     """Example showing different QoS levels and their use cases."""
@@ -32,84 +112,15 @@ async def main():
         logger.info("Connecting to MQTT broker...")
         await mqtt.connect()
         
-        # QoS 0: Fire-and-forget (best for high-volume, non-critical data)
-        # Use for: Debug logs, non-critical telemetry, high-frequency sensor data
-        await mqtt.subscribe(
-            topic="logs/debug/+",
-            pipeline_name="debug_log_processor",
-            qos=0,  # At most once delivery
-            execution_mode="async"  # Process in background
-        )
-        
-        await mqtt.subscribe(
-            topic="telemetry/+/heartbeat",
-            pipeline_name="heartbeat_processor", 
-            qos=0,  # Fire-and-forget for frequent heartbeats
-            execution_mode="async"
-        )
-        
-        # QoS 1: At-least-once delivery (good for important events)
-        # Use for: Business events, important sensor readings, user actions
-        await mqtt.subscribe(
-            topic="sensors/+/temperature",
-            pipeline_name="temperature_processor",
-            qos=1,  # At least once delivery
-            execution_mode="async"
-        )
-        
-        await mqtt.subscribe(
-            topic="events/user/+/login", 
-            pipeline_name="user_login_processor",
-            qos=1,  # Important user events
-            execution_mode="async" 
-        )
-        
-        await mqtt.subscribe(
-            topic="orders/+/created",
-            pipeline_name="order_created_processor",
-            qos=1,  # Business-critical events
-            execution_mode="async"
-        )
-        
-        # QoS 2: Exactly-once delivery (critical business processes)
-        # Use for: Financial transactions, critical alerts, regulatory data
-        await mqtt.subscribe(
-            topic="payments/+/completed",
-            pipeline_name="payment_completion_processor",
-            qos=2,  # Exactly once for financial data
-            execution_mode="sync"  # Process immediately
-        )
-        
-        await mqtt.subscribe(
-            topic="alerts/critical/+",
-            pipeline_name="critical_alert_handler",
-            qos=2,  # Critical alerts must be processed
-            execution_mode="sync"  # Immediate processing
-        )
-        
-        await mqtt.subscribe(
-            topic="compliance/audit/+",
-            pipeline_name="audit_log_processor",
-            qos=2,  # Regulatory compliance data
-            execution_mode="sync"
-        )
-        
-        # Mixed mode: Let QoS level determine execution mode
-        # QoS 2 -> sync, QoS 0/1 -> async
-        await mqtt.subscribe(
-            topic="mixed/data/+",
-            pipeline_name="mixed_data_processor",
-            qos=1,  # Will be processed async due to mixed mode
-            execution_mode="mixed"
-        )
+        # All subscriptions go to the broker in a single SUBSCRIBE packet
+        await mqtt.subscribe_bulk(_SUBSCRIPTIONS)
         
         # Display subscription summary
         subscriptions = mqtt.get_subscriptions()
         logger.info(f"Configured {len(subscriptions)} subscriptions with different QoS levels:")
         
-        qos_counts = {0: 0, 1: 0, 2: 0}
+        qos_counts = mqtt.get_qos_distribution()  # Maintained by the plugin
         for sub in subscriptions:
-            qos_counts[sub['qos']] += 1
             logger.info(
                 f"  - {sub['topic']} -> {sub['pipeline']} "
                 f"(QoS {sub['qos']}, {sub['execution_mode']} mode)"
@@ -124,37 +135,30 @@ async def main():
         # Monitor and display statistics periodically
         logger.info("Monitoring message processing. Statistics will be shown every 15 seconds...")
         
-        for i in range(300):  # Run for 5 minutes
-            await asyncio.sleep(1)
-            
-            if i % 15 == 0:  # Show stats every 15 seconds
+        # The log level does not change while the loop runs
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        for i in range(0, 300, 15):  # Run for 5 minutes, showing stats every 15 seconds
+            if info_enabled:
+                # Skip the statistics snapshot entirely when INFO is disabled
                 stats = mqtt.get_statistics()
-                logger.info(
-                    f"=== Statistics (after {i}s) ==="
-                )
-                logger.info(
-                    f"Messages processed: {stats.get('message_count', 0)}"
-                )
-                logger.info(
-                    f"Pipeline executions: {stats.get('pipeline_count', 0)}"
-                )
-                logger.info(
-                    f"Errors: {stats.get('error_count', 0)}"
-                )
-                logger.info(
-                    f"Job queue enabled: {stats.get('job_queue_enabled', False)}"
-                )
+                lines = [
+                    f"=== Statistics (after {i}s) ===",
+                    f"Messages processed: {stats.get('message_count', 0)}",
+                    f"Pipeline executions: {stats.get('pipeline_count', 0)}",
+                    f"Errors: {stats.get('error_count', 0)}",
+                    f"Job queue enabled: {stats.get('job_queue_enabled', False)}",
+                ]
                 
                 # Show individual subscription stats
-                current_subs = mqtt.get_subscriptions()
-                for sub in current_subs:
-                    if sub.get('message_count', 0) > 0:
-                        logger.info(
-                            f"  {sub['topic']}: {sub.get('message_count', 0)} messages "
-                            f"(QoS {sub['qos']})"
-                        )
+                lines.extend(
+                    f"  {topic}: {count} messages (QoS {qos})"
+                    for topic, count, qos in mqtt.iter_active_subscriptions()
+                )
+                lines.append("=" * 40)
                 
-                logger.info("=" * 40)
+                # One log record per report instead of one per line
+                logger.info("\n".join(lines))
+            await asyncio.sleep(15)
         
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
@@ -164,28 +168,31 @@ async def main():
         # Clean shutdown
         logger.info("Stopping MQTT plugin...")
         await mqtt.stop_listener(timeout=10.0)
+        
+        # Read final statistics once the listener has drained, while
+        # the plugin is still connected
+        stats = mqtt.get_statistics()
         await mqtt.disconnect()
         
         # Show final statistics
-        try:
-            stats = mqtt.get_statistics()
-            logger.info("=== Final Statistics ===")
-            logger.info(f"Total messages processed: {stats.get('message_count', 0)}")
-            logger.info(f"Total pipeline executions: {stats.get('pipeline_count', 0)}")
-            logger.info(f"Total errors: {stats.get('error_count', 0)}")
-            logger.info("========================")
-        except:
-            pass
+        logger.info("=== Final Statistics ===")
+        logger.info(f"Total messages processed: {stats.get('message_count', 0)}")
+        logger.info(f"Total pipeline executions: {stats.get('pipeline_count', 0)}")
+        logger.info(f"Total errors: {stats.get('error_count', 0)}")
+        logger.info("========================")
         
         logger.info("MQTT plugin stopped")
 
 
 if __name__ == "__main__":
-    print("QoS Level Guide:")
-    print("QoS 0: Fire-and-forget - Fast, no delivery guarantee")
-    print("QoS 1: At-least-once - Reliable, may get duplicates") 
-    print("QoS 2: Exactly-once - Reliable, no duplicates (slower)")
-    print()
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
     
-    # Run the example
-    asyncio.run(main())
\ No newline at end of file
+    # Run the example on uvloop when it is installed (not available on Windows,
+    # where the default selector event loop is used instead)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
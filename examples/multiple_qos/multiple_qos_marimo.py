@@ -129,20 +129,21 @@ async def _(logger, mqtt):
     # QoS 0: Fire-and-forget (best for high-volume, non-critical data)
     # Use for: Debug logs, non-critical telemetry, high-frequency sensor data
 
-    await mqtt.subscribe(
-        topic="logs/debug/+",
-        pipeline_name="debug_log_processor",
-        qos=0,  # At most once delivery
-        execution_mode="async"  # Process in background
-    )
+    await mqtt.subscribe_bulk([
+        {
+            "topic": "logs/debug/+",
+            "pipeline": "debug_log_processor",
+            "qos": 0,  # At most once delivery
+            "execution_mode": "async"  # Process in background
+        },
+        {
+            "topic": "telemetry/+/heartbeat",
+            "pipeline": "heartbeat_processor",
+            "qos": 0,  # Fire-and-forget for frequent heartbeats
+            "execution_mode": "async"
+        }
+    ])
     logger.info("Subscribed to debug logs (QoS 0)")
-
-    await mqtt.subscribe(
-        topic="telemetry/+/heartbeat",
-        pipeline_name="heartbeat_processor", 
-        qos=0,  # Fire-and-forget for frequent heartbeats
-        execution_mode="async"
-    )
     logger.info("Subscribed to heartbeat telemetry (QoS 0)")
     return
 
@@ -164,28 +165,28 @@ async def _(logger, mqtt):
     # QoS 1: At-least-once delivery (good for important events)
     # Use for: Business events, important sensor readings, user actions
 
-    await mqtt.subscribe(
-        topic="sensors/+/temperature",
-        pipeline_name="temperature_processor",
-        qos=1,  # At least once delivery
-        execution_mode="async"
-    )
+    await mqtt.subscribe_bulk([
+        {
+            "topic": "sensors/+/temperature",
+            "pipeline": "temperature_processor",
+            "qos": 1,  # At least once delivery
+            "execution_mode": "async"
+        },
+        {
+            "topic": "events/user/+/login",
+            "pipeline": "user_login_processor",
+            "qos": 1,  # Important user events
+            "execution_mode": "async"
+        },
+        {
+            "topic": "orders/+/created",
+            "pipeline": "order_created_processor",
+            "qos": 1,  # Business-critical events
+            "execution_mode": "async"
+        }
+    ])
     logger.info("Subscribed to temperature sensors (QoS 1)")
-
-    await mqtt.subscribe(
-        topic="events/user/+/login", 
-        pipeline_name="user_login_processor",
-        qos=1,  # Important user events
-        execution_mode="async" 
-    )
     logger.info("Subscribed to user login events (QoS 1)")
-
-    await mqtt.subscribe(
-        topic="orders/+/created",
-        pipeline_name="order_created_processor",
-        qos=1,  # Business-critical events
-        execution_mode="async"
-    )
     logger.info("Subscribed to order creation events (QoS 1)")
     return
 
@@ -207,28 +208,28 @@ async def _(logger, mqtt):
     # QoS 2: Exactly-once delivery (critical business processes)
     # Use for: Financial transactions, critical alerts, regulatory data
 
-    await mqtt.subscribe(
-        topic="payments/+/completed",
-        pipeline_name="payment_completion_processor",
-        qos=2,  # Exactly once for financial data
-        execution_mode="sync"  # Process immediately
-    )
+    await mqtt.subscribe_bulk([
+        {
+            "topic": "payments/+/completed",
+            "pipeline": "payment_completion_processor",
+            "qos": 2,  # Exactly once for financial data
+            "execution_mode": "sync"  # Process immediately
+        },
+        {
+            "topic": "alerts/critical/+",
+            "pipeline": "critical_alert_handler",
+            "qos": 2,  # Critical alerts must be processed
+            "execution_mode": "sync"  # Immediate processing
+        },
+        {
+            "topic": "compliance/audit/+",
+            "pipeline": "audit_log_processor",
+            "qos": 2,  # Regulatory compliance data
+            "execution_mode": "sync"
+        }
+    ])
     logger.info("Subscribed to payment completions (QoS 2)")
-
-    await mqtt.subscribe(
-        topic="alerts/critical/+",
-        pipeline_name="critical_alert_handler",
-        qos=2,  # Critical alerts must be processed
-        execution_mode="sync"  # Immediate processing
-    )
     logger.info("Subscribed to critical alerts (QoS 2)")
-
-    await mqtt.subscribe(
-        topic="compliance/audit/+",
-        pipeline_name="audit_log_processor",
-        qos=2,  # Regulatory compliance data
-        execution_mode="sync"
-    )
     logger.info("Subscribed to audit logs (QoS 2)")
     return
 
@@ -275,9 +276,8 @@ def _(mo):
 def _(logger, mqtt):
     subscriptions = mqtt.get_subscriptions()
     logger.info(f'Configured {len(subscriptions)} subscriptions with different QoS levels:')
-    qos_counts = {0: 0, 1: 0, 2: 0}
+    qos_counts = mqtt.get_qos_distribution()  # Maintained by the plugin
     for _sub in subscriptions:
-        qos_counts[_sub['qos']] = qos_counts[_sub['qos']] + 1
         logger.info(f"  - {_sub['topic']} -> {_sub['pipeline']} (QoS {_sub['qos']}, {_sub['execution_mode']} mode)")
     logger.info(f'QoS distribution: QoS 0: {qos_counts[0]}, QoS 1: {qos_counts[1]}, QoS 2: {qos_counts[2]}')
     return
@@ -317,22 +317,26 @@ def _(mo):
 
 
 @app.cell
-async def _(asyncio, logger, mqtt):
+async def _(asyncio, logger, logging, mqtt):
     logger.info('Monitoring message processing. Statistics will be shown every 15 seconds...')
-    for i in range(300):
-        await asyncio.sleep(1)
-        if i % 15 == 0:
+    _info_enabled = logger.isEnabledFor(logging.INFO)
+    for i in range(0, 300, 15):
+        if _info_enabled:
             _stats = mqtt.get_statistics()
-            logger.info(f'=== Statistics (after {i}s) ===')
-            logger.info(f"Messages processed: {_stats.get('message_count', 0)}")
-            logger.info(f"Pipeline executions: {_stats.get('pipeline_count', 0)}")
-            logger.info(f"Errors: {_stats.get('error_count', 0)}")
-            logger.info(f"Job queue enabled: {_stats.get('job_queue_enabled', False)}")
-            current_subs = mqtt.get_subscriptions()
-            for _sub in current_subs:
-                if _sub.get('message_count', 0) > 0:
-                    logger.info(f"  {_sub['topic']}: {_sub.get('message_count', 0)} messages (QoS {_sub['qos']})")
-            logger.info('=' * 40)
+            _lines = [
+                f'=== Statistics (after {i}s) ===',
+                f"Messages processed: {_stats.get('message_count', 0)}",
+                f"Pipeline executions: {_stats.get('pipeline_count', 0)}",
+                f"Errors: {_stats.get('error_count', 0)}",
+                f"Job queue enabled: {_stats.get('job_queue_enabled', False)}",
+            ]
+            _lines.extend(
+                f'  {_topic}: {_count} messages (QoS {_qos})'
+                for _topic, _count, _qos in mqtt.iter_active_subscriptions()
+            )
+            _lines.append('=' * 40)
+            logger.info('\n'.join(_lines))  # One log record per report
+        await asyncio.sleep(15)
     return
 
 
@@ -352,17 +356,14 @@ def _(mo):
 async def _(logger, mqtt):
     logger.info('Stopping MQTT plugin...')
     await mqtt.stop_listener(timeout=10.0)
+    _stats = mqtt.get_statistics()  # Before disconnecting
     await mqtt.disconnect()
     logger.info('MQTT plugin stopped')
-    try:
-        _stats = mqtt.get_statistics()
-        logger.info('=== Final Statistics ===')
-        logger.info(f"Total messages processed: {_stats.get('message_count', 0)}")
-        logger.info(f"Total pipeline executions: {_stats.get('pipeline_count', 0)}")
-        logger.info(f"Total errors: {_stats.get('error_count', 0)}")
-        logger.info('========================')
-    except:
-        pass
+    logger.info('=== Final Statistics ===')
+    logger.info(f"Total messages processed: {_stats.get('message_count', 0)}")
+    logger.info(f"Total pipeline executions: {_stats.get('pipeline_count', 0)}")
+    logger.info(f"Total errors: {_stats.get('error_count', 0)}")
+    logger.info('========================')
     return
 
 
@@ -379,49 +380,47 @@ def _(mo):
 
 
 @app.cell
-def _(MQTTPlugin, asyncio, logging):
+def _(asyncio, logging, mqtt):
     logging.basicConfig(level=logging.INFO)
     logger_1 = logging.getLogger(__name__)
 
-    async def main():
-        """Example showing different QoS levels and their use cases."""
-        mqtt = MQTTPlugin(broker='localhost', port=1883, base_dir='.', use_job_queue=True, redis_url='redis://localhost:6379', client_id='flowerpower_qos_example')
+    async def main(mqtt):
+        """Example showing different QoS levels and their use cases.
+
+        Reuses the plugin created above instead of opening a second
+        broker connection and Redis pool.
+        """
         try:
             logger_1.info('Connecting to MQTT broker...')
             await mqtt.connect()
-            await mqtt.subscribe(topic='logs/debug/+', pipeline_name='debug_log_processor', qos=0, execution_mode='async')
-            await mqtt.subscribe(topic='telemetry/+/heartbeat', pipeline_name='heartbeat_processor', qos=0, execution_mode='async')
-            await mqtt.subscribe(topic='sensors/+/temperature', pipeline_name='temperature_processor', qos=1, execution_mode='async')
-            await mqtt.subscribe(topic='events/user/+/login', pipeline_name='user_login_processor', qos=1, execution_mode='async')
-            await mqtt.subscribe(topic='orders/+/created', pipeline_name='order_created_processor', qos=1, execution_mode='async')
-            await mqtt.subscribe(topic='payments/+/completed', pipeline_name='payment_completion_processor', qos=2, execution_mode='sync')
-            await mqtt.subscribe(topic='alerts/critical/+', pipeline_name='critical_alert_handler', qos=2, execution_mode='sync')
-            await mqtt.subscribe(topic='compliance/audit/+', pipeline_name='audit_log_processor', qos=2, execution_mode='sync')
-            await mqtt.subscribe(topic='mixed/data/+', pipeline_name='mixed_data_processor', qos=1, execution_mode='mixed')
+            await mqtt.subscribe_bulk([('logs/debug/+', 'debug_log_processor', 0, 'async'), ('telemetry/+/heartbeat', 'heartbeat_processor', 0, 'async'), ('sensors/+/temperature', 'temperature_processor', 1, 'async'), ('events/user/+/login', 'user_login_processor', 1, 'async'), ('orders/+/created', 'order_created_processor', 1, 'async'), ('payments/+/completed', 'payment_completion_processor', 2, 'sync'), ('alerts/critical/+', 'critical_alert_handler', 2, 'sync'), ('compliance/audit/+', 'audit_log_processor', 2, 'sync'), ('mixed/data/+', 'mixed_data_processor', 1, 'mixed')])
             subscriptions = mqtt.get_subscriptions()
             logger_1.info(f'Configured {len(subscriptions)} subscriptions with different QoS levels:')
-            qos_counts = {0: 0, 1: 0, 2: 0}
+            qos_counts = mqtt.get_qos_distribution()
             for _sub in subscriptions:
-                qos_counts[_sub['qos']] = qos_counts[_sub['qos']] + 1
                 logger_1.info(f"  - {_sub['topic']} -> {_sub['pipeline']} (QoS {_sub['qos']}, {_sub['execution_mode']} mode)")
             logger_1.info(f'QoS distribution: QoS 0: {qos_counts[0]}, QoS 1: {qos_counts[1]}, QoS 2: {qos_counts[2]}')
             logger_1.info('Starting MQTT listener. Press Ctrl+C to stop...')
             await mqtt.start_listener(background=True)
             logger_1.info('Monitoring message processing. Statistics will be shown every 15 seconds...')
-            for i in range(300):
-                await asyncio.sleep(1)
-                if i % 15 == 0:
+            _info_enabled = logger_1.isEnabledFor(logging.INFO)
+            for i in range(0, 300, 15):
+                if _info_enabled:
                     _stats = mqtt.get_statistics()
-                    logger_1.info(f'=== Statistics (after {i}s) ===')
-                    logger_1.info(f"Messages processed: {_stats.get('message_count', 0)}")
-                    logger_1.info(f"Pipeline executions: {_stats.get('pipeline_count', 0)}")
-                    logger_1.info(f"Errors: {_stats.get('error_count', 0)}")
-                    logger_1.info(f"Job queue enabled: {_stats.get('job_queue_enabled', False)}")
-                    current_subs = mqtt.get_subscriptions()
-                    for _sub in current_subs:
-                        if _sub.get('message_count', 0) > 0:
-                            logger_1.info(f"  {_sub['topic']}: {_sub.get('message_count', 0)} messages (QoS {_sub['qos']})")
-                    logger_1.info('=' * 40)
+                    _lines = [
+                        f'=== Statistics (after {i}s) ===',
+                        f"Messages processed: {_stats.get('message_count', 0)}",
+                        f"Pipeline executions: {_stats.get('pipeline_count', 0)}",
+                        f"Errors: {_stats.get('error_count', 0)}",
+                        f"Job queue enabled: {_stats.get('job_queue_enabled', False)}",
+                    ]
+                    _lines.extend(
+                        f'  {_topic}: {_count} messages (QoS {_qos})'
+                        for _topic, _count, _qos in mqtt.iter_active_subscriptions()
+                    )
+                    _lines.append('=' * 40)
+                    logger_1.info('\n'.join(_lines))  # One log record per report
+                await asyncio.sleep(15)
         except KeyboardInterrupt:
             logger_1.info('Received keyboard interrupt')
         except Exception as e:
@@ -429,16 +428,13 @@ def _(MQTTPlugin, asyncio, logging):
         finally:
             logger_1.info('Stopping MQTT plugin...')
             await mqtt.stop_listener(timeout=10.0)
+            _stats = mqtt.get_statistics()  # Before disconnecting
             await mqtt.disconnect()
-            try:
-                _stats = mqtt.get_statistics()
-                logger_1.info('=== Final Statistics ===')
-                logger_1.info(f"Total messages processed: {_stats.get('message_count', 0)}")
-                logger_1.info(f"Total pipeline executions: {_stats.get('pipeline_count', 0)}")
-                logger_1.info(f"Total errors: {_stats.get('error_count', 0)}")
-                logger_1.info('========================')
-            except:
-                pass
+            logger_1.info('=== Final Statistics ===')
+            logger_1.info(f"Total messages processed: {_stats.get('message_count', 0)}")
+            logger_1.info(f"Total pipeline executions: {_stats.get('pipeline_count', 0)}")
+            logger_1.info(f"Total errors: {_stats.get('error_count', 0)}")
+            logger_1.info('========================')
             logger_1.info('MQTT plugin stopped')
     return
 
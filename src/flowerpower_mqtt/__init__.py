@@ -10,10 +10,13 @@ import asyncio
 import logging
 import os
 import sys
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple, Union
 from pathlib import Path
+from weakref import WeakValueDictionary
 import importlib.metadata
 
+import msgspec
+
 from .client import MQTTClient
 from .listener import MQTTListener
 from .config import (
@@ -59,6 +62,9 @@ class MQTTPlugin:
     QoS levels and execution modes.
     """
     
+    # Plugins created by from_config, keyed by resolved config path and mtime
+    _instances: "WeakValueDictionary[Tuple[str, int], MQTTPlugin]" = WeakValueDictionary()
+    
     def __init__(
         self,
         broker: str = "localhost",
@@ -114,23 +120,49 @@ class MQTTPlugin:
         self.mqtt_client = MQTTClient(self.config.mqtt)
         self.listener: Optional[MQTTListener] = None
         self._connected = False
+        self._disconnected = False
+        
+        # YAML of the last saved configuration, reused until subscriptions change
+        self._config_yaml: Optional[bytes] = None
+        self._config_dirty = True
         
         # Configure logging level
         logging.getLogger().setLevel(getattr(logging, self.config.log_level.upper()))
     
     @classmethod
-    def from_config(cls, config_path: Union[str, Path]) -> "MQTTPlugin":
+    def from_config(cls, config_path: Union[str, Path], reuse: bool = False) -> "MQTTPlugin":
         """
         Create plugin instance from configuration file.
         
+        Each call returns a new plugin unless reuse is requested.
+        
         Args:
             config_path: Path to YAML configuration file
+            reuse: If True, loading the same unchanged file again returns the
+                   plugin created by an earlier reuse=True call, including its
+                   connection, as long as that plugin is still referenced and
+                   has not been disconnected
             
         Returns:
             Configured MQTTPlugin instance
         """
-        config = FlowerPowerMQTTConfig.from_yaml(Path(config_path))
-        return cls(config=config)
+        config_path = Path(config_path)
+        try:
+            key = (str(config_path.resolve()), config_path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+        
+        if reuse:
+            plugin = cls._instances.get(key)
+            if plugin is not None and type(plugin) is cls and not plugin._disconnected:
+                return plugin
+        
+        # Unchanged files are loaded from a decoded cache instead of re-parsing YAML
+        config = FlowerPowerMQTTConfig.from_yaml_cached(config_path)
+        plugin = cls(config=config)
+        if reuse:
+            cls._instances[key] = plugin
+        return plugin
     
     async def connect(self) -> None:
         """Connect to MQTT broker."""
@@ -141,6 +173,10 @@ class MQTTPlugin:
         logger.info(f"Connecting to MQTT broker at {self.config.mqtt.broker}:{self.config.mqtt.port}")
         await self.mqtt_client.connect()
         
+        # Subscriptions from the configuration go to the broker in one SUBSCRIBE packet
+        if self.config.subscriptions:
+            await self.mqtt_client.subscribe_many(self.config.subscriptions)
+        
         # Initialize listener
         self.listener = MQTTListener(self.mqtt_client, self.config)
         self._connected = True
@@ -161,6 +197,7 @@ class MQTTPlugin:
         
         await self.mqtt_client.disconnect()
         self._connected = False
+        self._disconnected = True
         
         logger.info("Successfully disconnected from MQTT broker")
     
@@ -192,44 +229,100 @@ class MQTTPlugin:
         if not self._connected:
             raise ConnectionError("Not connected to MQTT broker. Call connect() first.")
         
-        if qos not in [0, 1, 2]:
-            raise SubscriptionError(f"Invalid QoS level: {qos}. Must be 0, 1, or 2.")
-        
-        if execution_mode not in ["sync", "async", "mixed"]:
-            raise SubscriptionError(
-                f"Invalid execution mode: {execution_mode}. Must be 'sync', 'async', or 'mixed'."
-            )
+        self._validate_subscription(qos, execution_mode)
         
-        # Add to configuration
         subscription = SubscriptionConfig(
             topic=topic,
             pipeline=pipeline_name,
             qos=qos,
             execution_mode=execution_mode
         )
-        self.config.subscriptions.append(subscription)
+        if self._is_subscribed(subscription):
+            logger.debug(f"Already subscribed to '{topic}' -> pipeline '{pipeline_name}'")
+            return
         
         # Subscribe via MQTT client
         await self.mqtt_client.subscribe(topic, pipeline_name, qos, execution_mode)
         
+        # Add to configuration
+        self._store_subscriptions([subscription])
+        
         logger.info(
             f"Subscribed to '{topic}' -> pipeline '{pipeline_name}' "
             f"(QoS {qos}, {execution_mode} mode)"
         )
     
-    async def subscribe_bulk(self, subscriptions: List[Dict[str, Any]]) -> None:
+    async def subscribe_bulk(
+        self,
+        subscriptions: List[Union[Dict[str, Any], Sequence[Any]]]
+    ) -> None:
         """
         Subscribe to multiple topics at once.
         
+        All topics are sent to the broker in a single SUBSCRIBE packet.
+        Subscriptions identical to existing ones are skipped.
+        
         Args:
-            subscriptions: List of subscription dictionaries
+            subscriptions: List of subscription dictionaries, or tuples of
+                           (topic, pipeline, qos, execution_mode)
         """
-        for sub in subscriptions:
-            await self.subscribe(
-                topic=sub["topic"],
-                pipeline_name=sub["pipeline"],
-                qos=sub.get("qos", 0),
-                execution_mode=sub.get("execution_mode", "sync")
+        if not self._connected:
+            raise ConnectionError("Not connected to MQTT broker. Call connect() first.")
+        
+        try:
+            configs = SubscriptionConfig.from_records(subscriptions)
+        except (msgspec.ValidationError, ValueError, TypeError) as e:
+            raise SubscriptionError(f"Invalid subscription: {e}") from e
+        
+        # One subscription per topic, and none that are already in place
+        configs = [
+            sub for sub in {sub.topic: sub for sub in configs}.values()
+            if not self._is_subscribed(sub)
+        ]
+        if not configs:
+            return
+        
+        # Subscribe via MQTT client
+        await self.mqtt_client.subscribe_many(configs)
+        
+        # Add to configuration
+        self._store_subscriptions(configs)
+        
+        for sub in configs:
+            logger.info(
+                f"Subscribed to '{sub.topic}' -> pipeline '{sub.pipeline}' "
+                f"(QoS {sub.qos}, {sub.execution_mode} mode)"
+            )
+    
+    def _is_subscribed(self, subscription: SubscriptionConfig) -> bool:
+        """Check whether an identical subscription is already active."""
+        current = self.mqtt_client.get_subscription(subscription.topic)
+        return (
+            current is not None
+            and current.pipeline == subscription.pipeline
+            and current.qos == subscription.qos
+            and current.execution_mode == subscription.execution_mode
+            and current.deserialization_format == subscription.deserialization_format
+        )
+    
+    def _store_subscriptions(self, subscriptions: List[SubscriptionConfig]) -> None:
+        """Add subscriptions to the configuration, replacing any for the same topics."""
+        topics = {sub.topic for sub in subscriptions}
+        self.config.subscriptions = [
+            sub for sub in self.config.subscriptions if sub.topic not in topics
+        ]
+        self.config.subscriptions.extend(subscriptions)
+        self._config_dirty = True
+    
+    @staticmethod
+    def _validate_subscription(qos: int, execution_mode: str) -> None:
+        """Validate QoS level and execution mode of a subscription."""
+        if qos not in [0, 1, 2]:
+            raise SubscriptionError(f"Invalid QoS level: {qos}. Must be 0, 1, or 2.")
+        
+        if execution_mode not in ["sync", "async", "mixed"]:
+            raise SubscriptionError(
+                f"Invalid execution mode: {execution_mode}. Must be 'sync', 'async', or 'mixed'."
             )
     
     async def unsubscribe(self, topic: str) -> None:
@@ -248,6 +341,7 @@ class MQTTPlugin:
         self.config.subscriptions = [
             sub for sub in self.config.subscriptions if sub.topic != topic
         ]
+        self._config_dirty = True
         
         logger.info(f"Unsubscribed from '{topic}'")
     
@@ -276,6 +370,7 @@ class MQTTPlugin:
         if execution_mode:
             for sub in self.config.subscriptions:
                 sub.execution_mode = execution_mode
+            self._config_dirty = True
         
         logger.info(
             f"Starting listener with {len(self.config.subscriptions)} subscriptions "
@@ -329,6 +424,41 @@ class MQTTPlugin:
         
         return subscriptions
     
+    def iter_active_subscriptions(self) -> Iterator[Tuple[str, int, int]]:
+        """
+        Iterate over subscriptions that have received messages.
+        
+        Reads the runtime counters directly instead of building a dictionary
+        per subscription like get_subscriptions(), which suits periodic
+        monitoring loops. Consume the iterator without awaiting in between.
+        
+        Returns:
+            Iterator of (topic, message_count, qos) tuples
+        """
+        if not self._connected:
+            return iter(())
+        
+        return (
+            (sub.topic, sub.message_count, sub.qos)
+            for sub in self.mqtt_client.iter_subscriptions()
+            if sub.message_count
+        )
+    
+    def get_qos_distribution(self) -> Dict[int, int]:
+        """
+        Get the number of subscriptions per QoS level.
+        
+        Returns:
+            Dictionary mapping QoS level (0, 1, 2) to subscription count
+        """
+        if not self._connected:
+            counts = {0: 0, 1: 0, 2: 0}
+            for sub in self.config.subscriptions:
+                counts[sub.qos] += 1
+            return counts
+        
+        return self.mqtt_client.get_qos_distribution()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get plugin statistics.
@@ -348,14 +478,37 @@ class MQTTPlugin:
         
         return stats
     
+    def fill_statistics(self, out: Dict[str, Any]) -> None:
+        """
+        Update a caller-owned dict with the message, pipeline and error counters.
+        
+        Intended for periodic monitoring loops that reuse one dictionary
+        instead of calling get_statistics() on every tick.
+        
+        Args:
+            out: Dictionary to update in place
+        """
+        if self.listener:
+            self.listener.fill_statistics(out)
+        else:
+            out["message_count"] = 0
+            out["pipeline_count"] = 0
+            out["error_count"] = 0
+    
     def save_config(self, file_path: Union[str, Path]) -> None:
         """
         Save current configuration to YAML file.
         
+        The encoded YAML is kept and written again as-is on later saves until
+        subscriptions are changed through this plugin.
+        
         Args:
             file_path: Path where to save configuration
         """
-        self.config.to_yaml(Path(file_path))
+        if self._config_dirty or self._config_yaml is None:
+            self._config_yaml = self.config.to_yaml_bytes()
+            self._config_dirty = False
+        self.config.to_yaml(Path(file_path), encoded=self._config_yaml)
         logger.info(f"Configuration saved to {file_path}")
     
     @property
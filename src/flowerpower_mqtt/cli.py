@@ -309,7 +309,7 @@ def status(
 ):
     """Show current plugin status and statistics."""
     
-    async def _status():
+    def _status():
         try:
             # Load or use existing plugin
             plugin = _current_plugin or load_plugin(config=config)
@@ -368,7 +368,7 @@ def status(
             console.print(f"[red]Status check failed: {e}[/red]")
             raise typer.Exit(1)
     
-    handle_async(_status())
+    _status()
 
 
 @app.command()
@@ -489,7 +489,7 @@ def config_validate(
             task = progress.add_task("Validating configuration...", total=None)
             
             # Load and validate configuration
-            config = FlowerPowerMQTTConfig.from_yaml(config_file)
+            config = FlowerPowerMQTTConfig.from_yaml_cached(config_file)
             
             progress.update(task, description="✅ Configuration is valid")
         
@@ -541,7 +541,7 @@ def config_show(
             console.print("Use 'flowerpower-mqtt config create' to create a new configuration.")
             return
         
-        config = FlowerPowerMQTTConfig.from_yaml(config_path)
+        config = FlowerPowerMQTTConfig.from_yaml_cached(config_path)
         
         if format_output == "json":
             config_dict = config.to_dict()
@@ -594,7 +594,7 @@ def config_edit(
             
             # Validate after editing
             try:
-                FlowerPowerMQTTConfig.from_yaml(config_path)
+                FlowerPowerMQTTConfig.from_yaml_cached(config_path)
                 console.print("[green]✅ Configuration is valid[/green]")
             except Exception as e:
                 console.print(f"[yellow]⚠️  Configuration validation warning: {e}[/yellow]")
@@ -714,7 +714,7 @@ def list_subscriptions(
 ):
     """List all MQTT subscriptions."""
     
-    async def _list_subscriptions():
+    def _list_subscriptions():
         try:
             plugin = _current_plugin or load_plugin(config=config)
             subscriptions = plugin.get_subscriptions()
@@ -759,7 +759,7 @@ def list_subscriptions(
             console.print(f"[red]Failed to list subscriptions: {e}[/red]")
             raise typer.Exit(1)
     
-    handle_async(_list_subscriptions())
+    _list_subscriptions()
 
 
 @app.command() 
@@ -813,7 +813,7 @@ def jobs_status(
 ):
     """Show job queue status."""
     
-    async def _jobs_status():
+    def _jobs_status():
         try:
             plugin = _current_plugin or load_plugin(config=config)
             
@@ -848,7 +848,7 @@ def jobs_status(
             console.print(f"[red]Failed to get job queue status: {e}[/red]")
             raise typer.Exit(1)
     
-    handle_async(_jobs_status())
+    _jobs_status()
 
 
 @jobs_app.command("worker")
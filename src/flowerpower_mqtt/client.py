@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
-from typing import Dict, Optional, Callable, Any, List, Type, Union
+import sys
+from collections import OrderedDict
+from typing import Awaitable, Dict, Optional, Callable, Any, Iterator, List, Type, Union
 import time
 
 import aiomqtt
@@ -13,11 +15,15 @@ import pickle
 from google.protobuf.message import Message as ProtobufMessage
 import pyarrow as pa
 
-from .config import MQTTConfig, RuntimeSubscription
+from .config import MQTTConfig, RuntimeSubscription, SubscriptionConfig
 from .exceptions import ConnectionError, SubscriptionError
+from .matcher import MQTTMatcher
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct received topics whose resolved subscription is memoized
+_MATCH_CACHE_SIZE = 4096
+
 
 class MQTTMessage(msgspec.Struct):
     """Immutable wrapper for MQTT messages with additional metadata and deserialization support."""
@@ -56,11 +62,8 @@ class MQTTMessage(msgspec.Struct):
 
     def deserialize_json(self) -> Optional[Any]:
         """Deserialize payload as JSON using msgspec."""
-        payload_str = self.payload_str
-        if payload_str is None:
-            logger.debug("Cannot deserialize non-UTF-8 payload as JSON")
-            return None
-
+        # msgspec decodes (and validates UTF-8) straight from the raw bytes,
+        # so there is no need to build an intermediate str first.
         try:
             return msgspec.json.decode(self.payload, type=Any)
         except Exception as e:
@@ -340,8 +343,11 @@ class MQTTClient:
         self.config = config
         self._client: Optional[aiomqtt.Client] = None
         self._subscriptions: Dict[str, RuntimeSubscription] = {}
+        self._qos_counts = [0, 0, 0]  # Active subscriptions per QoS level
+        self._matcher = MQTTMatcher()
+        self._match_cache: "OrderedDict[str, Optional[RuntimeSubscription]]" = OrderedDict()
         self._connected = False
-        self._message_handlers: List[Callable[[MQTTMessage], None]] = []
+        self._message_handlers: List[Callable[[MQTTMessage], Optional[Awaitable[None]]]] = []
         self._lock = asyncio.Lock()
 
     async def __aenter__(self):
@@ -441,19 +447,26 @@ class MQTTClient:
         if qos not in [0, 1, 2]:
             raise SubscriptionError(f"Invalid QoS level: {qos}. Must be 0, 1, or 2")
 
+        # Interned keys let exact-topic lookups short-circuit on identity
+        topic = sys.intern(topic)
+        pipeline = sys.intern(pipeline)
+        execution_mode = sys.intern(execution_mode)
+
         try:
             logger.info(f"Subscribing to topic '{topic}' with QoS {qos}")
 
             await self._client.subscribe(topic, qos=qos)
 
             # Store subscription info
-            self._subscriptions[topic] = RuntimeSubscription(
+            subscription = RuntimeSubscription(
                 topic=topic,
                 pipeline=pipeline,
                 qos=qos,
                 execution_mode=execution_mode,
                 deserialization_format=deserialization_format
             )
+            self._add_subscription(subscription)
+            self._match_cache.clear()
 
             logger.info(
                 f"Successfully subscribed to '{topic}' -> pipeline '{pipeline}'"
@@ -463,6 +476,54 @@ class MQTTClient:
             logger.error(f"Failed to subscribe to topic '{topic}': {e}")
             raise SubscriptionError(f"Failed to subscribe to topic '{topic}': {e}") from e
 
+    async def subscribe_many(self, subscriptions: List[SubscriptionConfig]) -> None:
+        """
+        Subscribe to multiple MQTT topics with a single SUBSCRIBE packet.
+
+        Args:
+            subscriptions: Validated subscription configurations
+        """
+        if not self._connected or self._client is None:
+            raise ConnectionError("Client not connected to broker")
+
+        if not subscriptions:
+            return
+
+        # One entry per topic filter; a later entry for the same topic wins
+        subscriptions = list({sub.topic: sub for sub in subscriptions}.values())
+        topics = [(sub.topic, sub.qos) for sub in subscriptions]
+
+        try:
+            logger.info(f"Subscribing to {len(topics)} topics")
+
+            await self._client.subscribe(topics)
+
+            # Store subscription info (SubscriptionConfig fields are already interned)
+            for sub in subscriptions:
+                self._add_subscription(RuntimeSubscription(
+                    topic=sub.topic,
+                    pipeline=sub.pipeline,
+                    qos=sub.qos,
+                    execution_mode=sub.execution_mode,
+                    deserialization_format=sub.deserialization_format
+                ))
+            self._match_cache.clear()
+
+            logger.info(f"Successfully subscribed to {len(topics)} topics")
+
+        except Exception as e:
+            logger.error(f"Failed to subscribe to topics {[t for t, _ in topics]}: {e}")
+            raise SubscriptionError(f"Failed to subscribe to topics: {e}") from e
+
+    def _add_subscription(self, subscription: RuntimeSubscription) -> None:
+        """Register a subscription, replacing any existing one for its topic."""
+        previous = self._subscriptions.get(subscription.topic)
+        if previous is not None:
+            self._qos_counts[previous.qos] -= 1
+        self._subscriptions[subscription.topic] = subscription
+        self._qos_counts[subscription.qos] += 1
+        self._matcher[subscription.topic_levels] = subscription
+
     async def unsubscribe(self, topic: str) -> None:
         """
         Unsubscribe from MQTT topic.
@@ -480,7 +541,10 @@ class MQTTClient:
 
             # Remove subscription info
             if topic in self._subscriptions:
-                del self._subscriptions[topic]
+                subscription = self._subscriptions.pop(topic)
+                self._qos_counts[subscription.qos] -= 1
+                del self._matcher[subscription.topic_levels]
+                self._match_cache.clear()
 
             logger.info(f"Successfully unsubscribed from '{topic}'")
 
@@ -488,16 +552,17 @@ class MQTTClient:
             logger.error(f"Failed to unsubscribe from topic '{topic}': {e}")
             raise SubscriptionError(f"Failed to unsubscribe from topic '{topic}': {e}") from e
 
-    def add_message_handler(self, handler: Callable[[MQTTMessage], None]) -> None:
+    def add_message_handler(self, handler: Callable[[MQTTMessage], Optional[Awaitable[None]]]) -> None:
         """
         Add message handler function.
 
         Args:
-            handler: Function to call when messages arrive
+            handler: Function to call when messages arrive. If it returns an
+                awaitable, the listener awaits it before reading the next message.
         """
         self._message_handlers.append(handler)
 
-    def remove_message_handler(self, handler: Callable[[MQTTMessage], None]) -> None:
+    def remove_message_handler(self, handler: Callable[[MQTTMessage], Optional[Awaitable[None]]]) -> None:
         """
         Remove message handler function.
 
@@ -519,12 +584,11 @@ class MQTTClient:
         try:
             async for message in self._client.messages:
                 # Update subscription statistics
-                topic_str = str(message.topic)
-                for topic_pattern, sub in self._subscriptions.items():
-                    if message.topic.matches(topic_pattern):
-                        sub.message_count += 1
-                        sub.last_message_time = time.time()
-                        break
+                topic_str = sys.intern(str(message.topic))
+                sub = self.find_subscription_for_topic(topic_str)
+                if sub is not None:
+                    sub.message_count += 1
+                    sub.last_message_time = time.time()
 
                 # Create wrapped message
                 # Convert payload to bytes to match MQTTMessage type
@@ -546,7 +610,11 @@ class MQTTClient:
                 # Dispatch to all handlers
                 for handler in self._message_handlers:
                     try:
-                        handler(mqtt_message)
+                        # A handler may return an awaitable to hold off reading
+                        # further messages, e.g. while its queue is full
+                        pending = handler(mqtt_message)
+                        if pending is not None:
+                            await pending
                     except Exception as e:
                         logger.error(f"Error in message handler: {e}")
 
@@ -570,6 +638,30 @@ class MQTTClient:
         """Get all current subscriptions."""
         return self._subscriptions.copy()
 
+    def iter_subscriptions(self) -> Iterator[RuntimeSubscription]:
+        """
+        Iterate over current subscriptions without copying them.
+
+        The iterator must be consumed before subscriptions change, i.e.
+        without awaiting in between.
+
+        Returns:
+            Iterator over RuntimeSubscription objects
+        """
+        return iter(self._subscriptions.values())
+
+    def get_qos_distribution(self) -> Dict[int, int]:
+        """
+        Get the number of active subscriptions per QoS level.
+
+        The counts are kept up to date on subscribe and unsubscribe, so this
+        does not scan the subscriptions.
+
+        Returns:
+            Dictionary mapping QoS level (0, 1, 2) to subscription count
+        """
+        return dict(enumerate(self._qos_counts))
+
     def find_subscription_for_topic(self, topic: str) -> Optional[RuntimeSubscription]:
         """
         Find subscription that matches a specific topic.
@@ -578,18 +670,20 @@ class MQTTClient:
             topic: Specific topic to match against patterns
 
         Returns:
-            First matching RuntimeSubscription or None
+            Earliest added matching RuntimeSubscription or None
         """
-        for pattern, subscription in self._subscriptions.items():
-            try:
-                if aiomqtt.Topic(topic).matches(pattern):
-                    return subscription
-            except:
-                # Fallback to simple string comparison
-                if topic == pattern:
-                    return subscription
-
-        return None
+        # Recurring topics skip the trie walk; the cache is cleared whenever
+        # the subscriptions change
+        cache = self._match_cache
+        if topic in cache:
+            cache.move_to_end(topic)
+            return cache[topic]
+
+        subscription = self._matcher.first_match(topic)
+        cache[topic] = subscription
+        if len(cache) > _MATCH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return subscription
 
     @property
     def is_connected(self) -> bool:
@@ -1,7 +1,10 @@
 """Configuration management for FlowerPower MQTT plugin."""
 
-from typing import Optional, Dict, Any, List, Annotated
-from dataclasses import dataclass
+import os
+import sys
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Annotated, Iterable, Sequence, Tuple, Union
+from dataclasses import dataclass, field
 import msgspec
 from msgspec import Struct, Meta
 import yaml
@@ -30,6 +33,19 @@ def _validate_deserialization_format(value: str) -> str:
     return value
 
 
+# In-process cache of encoded configs: resolved path -> (mtime_ns, size, msgpack bytes).
+# Entries are decoded on every hit, so callers always get an independent copy.
+_CONFIG_CACHE_SIZE = 100
+_config_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _remember_config(path: str, stat: os.stat_result, data: bytes) -> None:
+    """Store an encoded config in the in-process cache."""
+    _config_cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+    _config_cache.move_to_end(path)
+    if len(_config_cache) > _CONFIG_CACHE_SIZE:
+        _config_cache.popitem(last=False)
+
 
 class MQTTConfig(Struct, frozen=True):
     """MQTT broker configuration."""
@@ -52,6 +68,10 @@ class JobQueueConfig(Struct, frozen=True):
     queue_name: str = "mqtt_pipelines"
     worker_count: int = 4
     max_retries: int = 3
+    max_inflight: int = 1000
+    dispatch_workers: int = 4
+    batch_size: int = 100
+    flush_interval_ms: int = 20
 
 
 class SubscriptionConfig(Struct):
@@ -67,6 +87,37 @@ class SubscriptionConfig(Struct):
         _validate_qos(self.qos)
         _validate_execution_mode(self.execution_mode)
         _validate_deserialization_format(self.deserialization_format)
+        
+        # Share one string object per distinct value across subscriptions,
+        # so lookups and comparisons on these fields short-circuit on identity
+        self.topic = sys.intern(self.topic)
+        self.pipeline = sys.intern(self.pipeline)
+        self.execution_mode = sys.intern(self.execution_mode)
+        self.deserialization_format = sys.intern(self.deserialization_format)
+    
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Union[Sequence[Any], Dict[str, Any]]]
+    ) -> List["SubscriptionConfig"]:
+        """
+        Build many subscriptions at once.
+        
+        Records are either dictionaries with the field names as keys or
+        tuples in field order (topic, pipeline, qos, execution_mode,
+        deserialization_format). Dictionaries are converted by msgspec in a
+        single call; every subscription is still validated.
+        
+        Args:
+            records: Subscription records
+            
+        Returns:
+            List of SubscriptionConfig instances
+        """
+        records = list(records)
+        if all(isinstance(rec, dict) for rec in records):
+            return msgspec.convert(records, List[cls])
+        return [cls(**rec) if isinstance(rec, dict) else cls(*rec) for rec in records]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for compatibility."""
@@ -80,6 +131,7 @@ class FlowerPowerMQTTConfig(Struct):
     subscriptions: List[SubscriptionConfig] = msgspec.field(default_factory=list)
     base_dir: str = "."
     log_level: str = "INFO"
+    compile_pipelines: bool = False
 
     @classmethod
     def from_yaml(cls, file_path: Path) -> "FlowerPowerMQTTConfig":
@@ -87,18 +139,60 @@ class FlowerPowerMQTTConfig(Struct):
         if not file_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {file_path}")
         
-        with open(file_path, 'r') as f:
+        # msgspec.yaml parses with PyYAML's libyaml CSafeLoader when available
+        with open(file_path, 'rb') as f:
             return msgspec.yaml.decode(f.read(), type=cls)
-        
 
+    @classmethod
+    def from_yaml_cached(cls, file_path: Path) -> "FlowerPowerMQTTConfig":
+        """
+        Load configuration from YAML file, reusing a msgpack cache of the
+        decoded config keyed by the file's path, mtime and size.
+
+        The cache lives in memory for the running process only; it is never
+        written to disk, since the config may hold broker and Redis
+        credentials. Every call returns a fresh config object, so runtime
+        changes to one instance never leak into another.
+        """
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {file_path}") from None
+
+        path = str(file_path.resolve())
+        cached = _config_cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _config_cache.move_to_end(path)
+            return msgspec.msgpack.decode(cached[2], type=cls)
+
+        config = cls.from_yaml(file_path)
+        _remember_config(path, stat, msgspec.msgpack.encode(config))
+        return config
+
+    
+    def to_yaml_bytes(self) -> bytes:
+        """Encode configuration as YAML."""
+        # msgspec converts the struct to builtins itself; no separate to_builtins pass
+        return msgspec.yaml.encode(self)
     
-    def to_yaml(self, file_path: Path) -> None:
-        """Save configuration to YAML file."""
-        # Convert struct to dictionary
-        data = msgspec.to_builtins(self)
+    def to_yaml(self, file_path: Path, encoded: Optional[bytes] = None) -> None:
+        """
+        Save configuration to YAML file.
+        
+        Args:
+            file_path: Path where to save configuration
+            encoded: YAML previously produced by to_yaml_bytes() for this
+                     unchanged configuration, written as-is when given
+        """
+        if encoded is None:
+            encoded = self.to_yaml_bytes()
         
         with open(file_path, 'wb') as f:
-            f.write(msgspec.yaml.encode(data))
+            f.write(encoded)
+        
+        # Prime the load cache so reloading the file just written skips YAML parsing
+        file_path = Path(file_path)
+        _remember_config(str(file_path.resolve()), file_path.stat(), msgspec.msgpack.encode(self))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for compatibility."""
@@ -115,4 +209,9 @@ class RuntimeSubscription:
     deserialization_format: str = "auto"
     message_count: int = 0
     last_message_time: Optional[float] = None
-    error_count: int = 0
\ No newline at end of file
+    error_count: int = 0
+    topic_levels: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Split the topic filter into interned levels once, for the matcher."""
+        self.topic_levels = tuple(sys.intern(level) for level in self.topic.split("/"))
\ No newline at end of file
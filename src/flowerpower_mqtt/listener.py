@@ -2,21 +2,45 @@
 
 import asyncio
 import logging
+import os
 import signal
-from typing import Optional, Dict, Any, List, Callable
+import time
+from typing import Optional, Dict, Any, Awaitable, List, Callable, Set, Tuple
 import json
 from datetime import datetime
 
 from flowerpower.pipeline import PipelineManager
 from flowerpower.job_queue import JobQueueManager
+from rq import Queue, Retry
 
 from .client import MQTTClient, MQTTMessage
 from .config import FlowerPowerMQTTConfig, JobQueueConfig
 from .job_handler import execute_pipeline_job
+from .pipeline_compiler import CompiledPipeline, compile_pipeline
 from .exceptions import PipelineExecutionError, JobQueueError
 
 logger = logging.getLogger(__name__)
 
+# Execution mode for "mixed" subscriptions, indexed by message QoS
+_MIXED_MODES = ("async", "async", "sync")
+
+# Seconds a foreground listener waits for queued async executions when it stops
+_FOREGROUND_DRAIN_TIMEOUT = 10.0
+
+# Seconds between checks of a compiled pipeline's files for changes on disk
+_COMPILED_RECHECK_INTERVAL = 2.0
+
+
+def _mtimes(paths: Tuple[str, ...]) -> Tuple[Optional[int], ...]:
+    """Modification times of files in nanoseconds, None for a missing file."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
 
 class MQTTListener:
     """
@@ -42,18 +66,34 @@ class MQTTListener:
         # FlowerPower managers
         self.pipeline_manager = PipelineManager(base_dir=config.base_dir)
         self.job_queue_manager: Optional[JobQueueManager] = None
+        self._rq_queue: Optional[Queue] = None
         
         # State management
         self._running = False
         self._listener_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
         
+        # Bounded hand-off from the message loop to the job-queue dispatch workers
+        self._async_queue: Optional[asyncio.Queue] = None
+        self._dispatch_tasks: List[asyncio.Task] = []
+        
         # Statistics
         self._message_count = 0
         self._pipeline_count = 0
         self._error_count = 0
         self._start_time: Optional[datetime] = None
         
+        # Compiled pipelines: name -> (function, default inputs,
+        # (module file, config file), their mtimes, next staleness check)
+        self._compiled_pipelines: Dict[
+            str,
+            Tuple[
+                CompiledPipeline, Dict[str, Any], Tuple[str, str],
+                Tuple[Optional[int], ...], float
+            ]
+        ] = {}
+        self._uncompilable_pipelines: Set[str] = set()
+        
         # Initialize job queue if enabled
         if config.job_queue.enabled:
             self._init_job_queue()
@@ -74,18 +114,53 @@ class MQTTListener:
                 base_dir=self.config.base_dir
             )
             
+            if jq_config.type == "rq":
+                self._rq_queue = self._find_rq_queue()
+            
             logger.info("Job queue manager initialized successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize job queue: {e}")
             raise JobQueueError(f"Failed to initialize job queue: {e}") from e
     
-    def _handle_message(self, message: MQTTMessage) -> None:
+    def _find_rq_queue(self) -> Optional[Queue]:
+        """
+        Find the RQ queue FlowerPower enqueues onto by default.
+        
+        This is the manager's first backend queue, bound to the backend's
+        pooled Redis connection; batched enqueues write to it directly.
+        The lookup relies on RQManager internals, so if they are missing,
+        None is returned and every job goes through JobQueueManager.enqueue.
+        
+        Returns:
+            The RQ queue, or None
+        """
+        try:
+            manager = self.job_queue_manager
+            queue = manager._queues[manager._queue_names[0]]
+        except (AttributeError, KeyError, IndexError, TypeError) as e:
+            logger.warning(
+                f"Cannot access the FlowerPower RQ queue, "
+                f"enqueueing jobs one at a time: {e!r}"
+            )
+            return None
+        
+        if not isinstance(queue, Queue):
+            logger.warning(
+                "FlowerPower RQ queue has an unexpected type, enqueueing jobs one at a time"
+            )
+            return None
+        return queue
+    
+    def _handle_message(self, message: MQTTMessage) -> Optional[Awaitable[None]]:
         """
         Handle incoming MQTT message.
         
         Args:
             message: MQTT message to process
+            
+        Returns:
+            An awaitable if the async dispatch queue is full, None otherwise
         """
         self._message_count += 1
         
@@ -111,7 +186,7 @@ class MQTTListener:
             if execution_mode == "sync":
                 self._execute_pipeline_sync(subscription.pipeline, message_data, message)
             elif execution_mode == "async":
-                self._execute_pipeline_async(subscription.pipeline, message_data, message)
+                return self._submit_pipeline_async(subscription.pipeline, message_data, message)
             else:
                 logger.error(f"Unknown execution mode: {execution_mode}")
                 self._error_count += 1
@@ -167,10 +242,65 @@ class MQTTListener:
         
         if mode == "mixed":
             # QoS 2 messages are executed synchronously, others async
-            return "sync" if message.qos >= 2 else "async"
+            return _MIXED_MODES[message.qos]
         
         return mode
     
+    def _get_compiled_pipeline(
+        self,
+        pipeline_name: str
+    ) -> Optional[Tuple[CompiledPipeline, Dict[str, Any]]]:
+        """
+        Get the compiled form of a pipeline, compiling it on first use.
+        
+        The pipeline module and its config file are checked for changes on
+        disk at most every _COMPILED_RECHECK_INTERVAL seconds, and the
+        compiled function is rebuilt when either has changed. Pipelines that cannot be compiled are
+        run through FlowerPower.
+        
+        Args:
+            pipeline_name: Name of pipeline to execute
+            
+        Returns:
+            Tuple of (compiled function, default inputs) or None
+        """
+        if pipeline_name in self._uncompilable_pipelines:
+            return None
+        
+        now = time.monotonic()
+        cached = self._compiled_pipelines.get(pipeline_name)
+        if cached is not None:
+            run, default_inputs, files, mtimes, next_check = cached
+            if now < next_check:
+                return run, default_inputs
+            if _mtimes(files) == mtimes:
+                self._compiled_pipelines[pipeline_name] = (
+                    run, default_inputs, files, mtimes, now + _COMPILED_RECHECK_INTERVAL
+                )
+                return run, default_inputs
+        
+        try:
+            run, default_inputs, module_file, config_file = compile_pipeline(
+                pipeline_name,
+                self.config.base_dir,
+                ("mqtt_message", "mqtt_topic", "mqtt_qos", "execution_timestamp", "execution_mode")
+            )
+            files = (str(module_file), str(config_file))
+            mtimes = _mtimes(files)
+        except Exception as e:
+            logger.warning(
+                f"Pipeline '{pipeline_name}' cannot be compiled, "
+                f"running it through FlowerPower: {e}"
+            )
+            self._uncompilable_pipelines.add(pipeline_name)
+            self._compiled_pipelines.pop(pipeline_name, None)
+            return None
+        
+        self._compiled_pipelines[pipeline_name] = (
+            run, default_inputs, files, mtimes, now + _COMPILED_RECHECK_INTERVAL
+        )
+        return run, default_inputs
+    
     def _execute_pipeline_sync(
         self, 
         pipeline_name: str, 
@@ -198,10 +328,18 @@ class MQTTListener:
             }
             
             # Execute pipeline
-            result = self.pipeline_manager.run(
-                name=pipeline_name,
-                inputs=pipeline_inputs
+            compiled = (
+                self._get_compiled_pipeline(pipeline_name)
+                if self.config.compile_pipelines else None
             )
+            if compiled is not None:
+                run, default_inputs = compiled
+                result = run({**default_inputs, **pipeline_inputs})
+            else:
+                result = self.pipeline_manager.run(
+                    name=pipeline_name,
+                    inputs=pipeline_inputs
+                )
             
             execution_time = (datetime.now() - start_time).total_seconds()
             self._pipeline_count += 1
@@ -218,6 +356,189 @@ class MQTTListener:
                 f"Synchronous execution of '{pipeline_name}' failed: {e}"
             ) from e
     
+    def _submit_pipeline_async(
+        self,
+        pipeline_name: str,
+        message_data: Dict[str, Any],
+        message: MQTTMessage
+    ) -> Optional[Awaitable[None]]:
+        """
+        Hand an async pipeline execution to the dispatch workers.
+        
+        Args:
+            pipeline_name: Name of pipeline to execute
+            message_data: Parsed message data
+            message: Original MQTT message
+            
+        Returns:
+            None if the execution was queued, or an awaitable that completes
+            once there is room in the full queue
+        """
+        queue = self._async_queue
+        if queue is None:
+            # No dispatch workers running; enqueue inline
+            self._execute_pipeline_async(pipeline_name, message_data, message)
+            return None
+        
+        item = (pipeline_name, message_data, message)
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Hold the message loop until a worker frees a slot
+            return queue.put(item)
+        return None
+    
+    async def _dispatch_worker(self) -> None:
+        """Take queued async executions and enqueue them in batches off the event loop."""
+        queue = self._async_queue
+        jq_config = self.config.job_queue
+        batch_size = max(jq_config.batch_size, 1)
+        flush_interval = jq_config.flush_interval_ms / 1000
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await queue.get()]
+            
+            # Collect more executions until the batch is full or the flush interval ends
+            deadline = loop.time() + flush_interval
+            while len(batch) < batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                # Enqueueing talks to the job queue backend and blocks; counters
+                # are only updated back on the event loop
+                job_ids = await asyncio.to_thread(self._enqueue_pipeline_jobs, batch)
+                self._pipeline_count += len(job_ids)
+                for (pipeline_name, _, _), job_id in zip(batch, job_ids):
+                    logger.info(
+                        f"Pipeline '{pipeline_name}' queued for async execution "
+                        f"(job ID: {job_id})"
+                    )
+            except Exception as e:
+                logger.error(f"Async pipeline execution failed: {e}")
+                self._error_count += len(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    def _start_dispatch_workers(self) -> None:
+        """Create the bounded async queue and its worker tasks."""
+        jq_config = self.config.job_queue
+        self._async_queue = asyncio.Queue(maxsize=jq_config.max_inflight)
+        self._dispatch_tasks = [
+            asyncio.create_task(self._dispatch_worker())
+            for _ in range(jq_config.dispatch_workers)
+        ]
+    
+    async def _stop_dispatch_workers(self, timeout: float) -> None:
+        """
+        Let the dispatch workers drain the queue, then stop them.
+        
+        Args:
+            timeout: Maximum time to wait for queued executions
+        """
+        if not self._dispatch_tasks:
+            return
+        
+        try:
+            await asyncio.wait_for(self._async_queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Dropping {self._async_queue.qsize()} queued async pipeline executions"
+            )
+        
+        for task in self._dispatch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
+        
+        self._dispatch_tasks = []
+        self._async_queue = None
+    
+    def _enqueue_pipeline_job(
+        self,
+        pipeline_name: str,
+        message_data: Dict[str, Any],
+        message: MQTTMessage
+    ) -> str:
+        """
+        Enqueue a pipeline execution job.
+        
+        Args:
+            pipeline_name: Name of pipeline to execute
+            message_data: Parsed message data
+            message: Original MQTT message
+            
+        Returns:
+            Job ID
+        """
+        job = self.job_queue_manager.enqueue(
+            execute_pipeline_job,
+            pipeline_name,
+            message_data,
+            self.config.base_dir,
+            message.topic,
+            message.qos,
+            {"execution_mode": "async"},
+            retry=self.config.job_queue.max_retries
+        )
+        return job.id if hasattr(job, 'id') else str(job)
+    
+    def _enqueue_pipeline_jobs(
+        self,
+        batch: List[Tuple[str, Dict[str, Any], MQTTMessage]]
+    ) -> List[str]:
+        """
+        Enqueue several pipeline execution jobs.
+        
+        With RQ, all jobs are written to the FlowerPower-managed queue in one
+        Redis pipeline, i.e. a single round trip, with the same retry
+        settings JobQueueManager.enqueue applies. Other queue types enqueue
+        the jobs one by one.
+        
+        Args:
+            batch: (pipeline name, parsed message data, MQTT message) tuples
+            
+        Returns:
+            Job IDs, in batch order
+        """
+        if self._rq_queue is None or len(batch) == 1:
+            return [self._enqueue_pipeline_job(*item) for item in batch]
+        
+        # Same conversion as JobQueueManager.add_job: no Retry for 0 retries
+        max_retries = self.config.job_queue.max_retries
+        retry = Retry(max=max_retries) if max_retries else None
+        
+        job_datas = [
+            Queue.prepare_data(
+                execute_pipeline_job,
+                args=(
+                    pipeline_name,
+                    message_data,
+                    self.config.base_dir,
+                    message.topic,
+                    message.qos,
+                    {"execution_mode": "async"}
+                ),
+                retry=retry
+            )
+            for pipeline_name, message_data, message in batch
+        ]
+        with self._rq_queue.connection.pipeline() as pipe:
+            jobs = self._rq_queue.enqueue_many(job_datas, pipeline=pipe)
+            pipe.execute()
+        return [job.id for job in jobs]
+    
     def _execute_pipeline_async(
         self, 
         pipeline_name: str, 
@@ -241,18 +562,7 @@ class MQTTListener:
             return None
         
         try:
-            # Enqueue pipeline execution job
-            job = self.job_queue_manager.enqueue(
-                execute_pipeline_job,
-                pipeline_name,
-                message_data,
-                self.config.base_dir,
-                message.topic,
-                message.qos,
-                {"execution_mode": "async"}
-            )
-            
-            job_id = job.id if hasattr(job, 'id') else str(job)
+            job_id = self._enqueue_pipeline_job(pipeline_name, message_data, message)
             self._pipeline_count += 1
             
             logger.info(
@@ -283,10 +593,18 @@ class MQTTListener:
         
         logger.info(f"Starting MQTT listener (background={background})")
         
+        if self.job_queue_manager and not self._dispatch_tasks:
+            self._start_dispatch_workers()
+        
         if background:
             self._listener_task = asyncio.create_task(self._listen_loop())
         else:
-            await self._listen_loop()
+            try:
+                await self._listen_loop()
+            finally:
+                # The listener is no longer running once the loop returns, so
+                # stop_listener() would skip it; flush the queued executions here
+                await self._stop_dispatch_workers(_FOREGROUND_DRAIN_TIMEOUT)
     
     async def _listen_loop(self) -> None:
         """Main listening loop."""
@@ -328,6 +646,7 @@ class MQTTListener:
         """
         if not self._running:
             logger.warning("Listener not running")
+            await self._stop_dispatch_workers(timeout)
             return
         
         logger.info("Stopping MQTT listener")
@@ -344,9 +663,26 @@ class MQTTListener:
             except (asyncio.TimeoutError, asyncio.CancelledError):
                 logger.warning("Listener task did not stop gracefully")
         
+        # No new messages arrive now; flush what is already queued
+        await self._stop_dispatch_workers(timeout)
+        
         self._running = False
         logger.info("MQTT listener stopped")
     
+    def fill_statistics(self, out: Dict[str, Any]) -> None:
+        """
+        Write the message, pipeline and error counters into a caller-owned dict.
+        
+        Cheaper than get_statistics() for periodic polling, as no new
+        dictionary or timestamp string is built.
+        
+        Args:
+            out: Dictionary to update in place
+        """
+        out["message_count"] = self._message_count
+        out["pipeline_count"] = self._pipeline_count
+        out["error_count"] = self._error_count
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get listener statistics.
@@ -369,6 +705,9 @@ class MQTTListener:
             "job_queue_enabled": self.config.job_queue.enabled
         }
         
+        if self._async_queue is not None:
+            stats["async_queue_size"] = self._async_queue.qsize()
+        
         # Add job queue stats if available
         if self.job_queue_manager:
             try:
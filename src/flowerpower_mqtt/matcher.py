@@ -0,0 +1,133 @@
+"""Topic-filter trie for routing MQTT messages to subscriptions."""
+
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+# A topic filter as a string, or already split into its levels
+TopicFilter = Union[str, Tuple[str, ...]]
+
+
+class _Node:
+    """Trie node: one topic level."""
+
+    __slots__ = ("children", "content")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # Filters ending at this node: full filter levels -> (insertion order, value).
+        # A filter and its '$share/<group>/' variants end at the same node
+        self.content: Dict[Tuple[str, ...], Tuple[int, Any]] = {}
+
+
+def _filter_levels(
+    topic_filter: TopicFilter
+) -> Tuple[Tuple[str, ...], Sequence[str]]:
+    """
+    Split a topic filter into levels.
+
+    Returns:
+        Tuple of (all levels, which identify the filter; the levels to
+        match on, without any shared-subscription prefix)
+    """
+    levels = tuple(topic_filter.split("/") if isinstance(topic_filter, str) else topic_filter)
+    if levels[0] == "$share" and len(levels) > 2:
+        # Shared subscriptions match on the topic filter after the group name
+        return levels, levels[2:]
+    return levels, levels
+
+
+class MQTTMatcher:
+    """
+    Map MQTT topic filters to values and look up the values matching a topic.
+
+    Filters are stored in a trie keyed by topic level, so matching a topic
+    costs O(levels) instead of testing every filter. '+' and '#' follow the
+    MQTT rules, including '#' matching its parent level and wildcards at the
+    first level not matching '$' topics. '$share/<group>/' prefixes are
+    ignored for matching.
+
+    When several filters match a topic, first_match() returns the one added
+    first, regardless of how specific it is.
+
+    Filters may be given either as strings or already split into a tuple of
+    levels, which spares re-splitting filters the caller keeps pre-split.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._seq = 0
+
+    def __setitem__(self, topic_filter: TopicFilter, value: Any) -> None:
+        key, levels = _filter_levels(topic_filter)
+        node = self._root
+        for level in levels:
+            node = node.children.setdefault(level, _Node())
+        existing = node.content.get(key)
+        if existing is None:
+            self._seq += 1
+            node.content[key] = (self._seq, value)
+        else:
+            # Re-subscribing keeps the filter's original position
+            node.content[key] = (existing[0], value)
+
+    def __getitem__(self, topic_filter: TopicFilter) -> Any:
+        key, levels = _filter_levels(topic_filter)
+        node = self._root
+        try:
+            for level in levels:
+                node = node.children[level]
+            return node.content[key][1]
+        except KeyError:
+            raise KeyError(topic_filter) from None
+
+    def __delitem__(self, topic_filter: TopicFilter) -> None:
+        key, levels = _filter_levels(topic_filter)
+        path = []
+        node = self._root
+        try:
+            for level in levels:
+                path.append((node, level))
+                node = node.children[level]
+            del node.content[key]
+        except KeyError:
+            raise KeyError(topic_filter) from None
+
+        # Prune nodes that no longer lead to any filter
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.content or child.children:
+                break
+            del parent.children[level]
+
+    def _iter_match(self, topic: str) -> Iterator[Tuple[int, Any]]:
+        levels = topic.split("/")
+        last = len(levels)
+        normal = not topic.startswith("$")
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            children = node.children
+            if i == last:
+                yield from node.content.values()
+            else:
+                child = children.get(levels[i])
+                if child is not None:
+                    stack.append((child, i + 1))
+                child = children.get("+")
+                if child is not None and (normal or i > 0):
+                    stack.append((child, i + 1))
+            child = children.get("#")
+            if child is not None and (normal or i > 0):
+                yield from child.content.values()
+
+    def iter_match(self, topic: str) -> Iterator[Any]:
+        """Yield the values of all filters matching a topic."""
+        for _, value in self._iter_match(topic):
+            yield value
+
+    def first_match(self, topic: str) -> Optional[Any]:
+        """Return the value of the earliest added filter matching a topic, or None."""
+        best = None
+        for content in self._iter_match(topic):
+            if best is None or content[0] < best[0]:
+                best = content
+        return best[1] if best is not None else None
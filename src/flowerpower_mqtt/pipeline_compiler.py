@@ -0,0 +1,166 @@
+"""Compile FlowerPower pipelines into flat Python closures for the sync hot path."""
+
+import importlib.util
+import logging
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import yaml
+
+from .exceptions import PipelineExecutionError
+
+logger = logging.getLogger(__name__)
+
+CompiledPipeline = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_pipeline_module(name: str, module_file: Path):
+    """
+    Import a pipeline module from its file under a private module name.
+
+    The module is registered in sys.modules (replacing an earlier load of
+    the same pipeline): Hamilton only collects functions whose module it
+    can resolve with inspect.getmodule().
+    """
+    module_name = f"_flowerpower_mqtt_pipeline_{name}"
+    spec = importlib.util.spec_from_file_location(module_name, module_file)
+    if spec is None or spec.loader is None:
+        raise PipelineExecutionError(f"Cannot import pipeline module: {module_file}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _topological_order(nodes: Iterable[Any]) -> List[Any]:
+    """Order Hamilton nodes so that every node comes after its dependencies."""
+    nodes = {node.name: node for node in nodes}
+    pending = {
+        name: {dep.name for dep in node.dependencies if dep.name in nodes}
+        for name, node in nodes.items()
+    }
+    dependents: Dict[str, List[str]] = {name: [] for name in nodes}
+    for name, deps in pending.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    ready = deque(sorted(name for name, deps in pending.items() if not deps))
+    ordered = []
+    while ready:
+        name = ready.popleft()
+        ordered.append(nodes[name])
+        for dependent in dependents[name]:
+            pending[dependent].discard(name)
+            if not pending[dependent]:
+                ready.append(dependent)
+
+    if len(ordered) != len(nodes):
+        raise PipelineExecutionError("Pipeline graph contains a cycle")
+    return ordered
+
+
+def _declares_adapters(pipeline_cfg: Dict[str, Any], run_cfg: Dict[str, Any]) -> bool:
+    """Whether a pipeline config configures or enables any FlowerPower adapter."""
+    adapter_cfg = pipeline_cfg.get("adapter") or {}
+    with_adapter = run_cfg.get("with_adapter") or {}
+    if isinstance(with_adapter, dict) and any(with_adapter.values()):
+        return True
+    return isinstance(adapter_cfg, dict) and any(adapter_cfg.values())
+
+
+def compile_pipeline(
+    name: str,
+    base_dir: str,
+    input_names: Iterable[str]
+) -> Tuple[CompiledPipeline, Dict[str, Any], Path, Path]:
+    """
+    Compile a FlowerPower pipeline into a single generated function.
+
+    Hamilton is used once to build and resolve the graph; the nodes needed
+    for the configured final vars are then emitted as straight-line calls
+    in topological order, so running the pipeline no longer walks the graph.
+
+    Args:
+        name: Pipeline name
+        base_dir: FlowerPower project base directory
+        input_names: Names of the inputs that will be passed on every run
+
+    Returns:
+        Tuple of (compiled function, default inputs from the pipeline config,
+        pipeline module file, pipeline config file)
+
+    Raises:
+        PipelineExecutionError: If the pipeline cannot be compiled
+    """
+    from hamilton import driver
+    from hamilton.node import DependencyType
+
+    module_file = Path(base_dir) / "pipelines" / f"{name}.py"
+    config_file = Path(base_dir) / "conf" / "pipelines" / f"{name}.yml"
+
+    pipeline_cfg: Dict[str, Any] = {}
+    if config_file.exists():
+        with open(config_file, "r") as f:
+            pipeline_cfg = yaml.load(f, Loader=_YAML_LOADER) or {}
+
+    if pipeline_cfg.get("params"):
+        # Params configure the Hamilton driver; leave those pipelines to FlowerPower
+        raise PipelineExecutionError(f"Pipeline '{name}' uses params and cannot be compiled")
+
+    run_cfg = pipeline_cfg.get("run") or {}
+    if _declares_adapters(pipeline_cfg, run_cfg):
+        logger.warning(
+            f"Pipeline '{name}' declares FlowerPower adapters; "
+            f"compiled runs skip adapters and hooks"
+        )
+    final_vars = run_cfg.get("final_vars")
+    if not final_vars:
+        raise PipelineExecutionError(f"Pipeline '{name}' defines no final_vars")
+    default_inputs = run_cfg.get("inputs") or {}
+
+    module = _load_pipeline_module(name, module_file)
+    dr = driver.Builder().with_modules(module).build()
+
+    provided = set(input_names) | set(default_inputs)
+    upstream, _ = dr.graph.get_upstream_nodes(final_vars, {k: None for k in provided})
+
+    # Node values live in one dict so node names never clash with generated locals
+    namespace: Dict[str, Any] = {}
+    lines = ["def _run(inputs):", "    _v = {}"]
+    available = set()
+    for index, node in enumerate(_topological_order(upstream)):
+        if node.user_defined:
+            if node.name in provided:
+                lines.append(f"    _v[{node.name!r}] = inputs[{node.name!r}]")
+                available.add(node.name)
+            continue
+
+        kwargs = []
+        for dep_name, (_, dep_type) in node.input_types.items():
+            if dep_name in available:
+                kwargs.append(f"{dep_name}=_v[{dep_name!r}]")
+            elif dep_type == DependencyType.REQUIRED:
+                raise PipelineExecutionError(
+                    f"Pipeline '{name}' node '{node.name}' requires missing input '{dep_name}'"
+                )
+        namespace[f"_fn{index}"] = node.callable
+        lines.append(f"    _v[{node.name!r}] = _fn{index}({', '.join(kwargs)})")
+        available.add(node.name)
+
+    lines.append(
+        "    return {" + ", ".join(f"{var!r}: _v[{var!r}]" for var in final_vars) + "}"
+    )
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<pipeline {name}>", "exec"), namespace)
+    logger.info(f"Compiled pipeline '{name}' ({len(lines) - 3} steps)")
+    return namespace["_run"], default_inputs, module_file, config_file
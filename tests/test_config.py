@@ -0,0 +1,201 @@
+"""Tests for config caching, config saving and plugin reuse in from_config."""
+
+import os
+from collections import OrderedDict
+
+import msgspec
+import pytest
+
+from flowerpower_mqtt import MQTTPlugin
+from flowerpower_mqtt import config as config_module
+from flowerpower_mqtt.config import FlowerPowerMQTTConfig, MQTTConfig, SubscriptionConfig
+
+
+class _FakeBroker:
+    """Stands in for aiomqtt.Client so plugins can connect without a broker."""
+
+    def __init__(self, **kwargs):
+        self.subscribed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def subscribe(self, topics, qos=0, **kwargs):
+        self.subscribed.append(topics)
+
+    async def unsubscribe(self, topic, **kwargs):
+        pass
+
+
+class _Calls:
+    """Wraps a function and counts how often it is called."""
+
+    def __init__(self, func):
+        self.func = func
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.func(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def empty_config_cache(monkeypatch):
+    monkeypatch.setattr(config_module, "_config_cache", OrderedDict())
+
+
+@pytest.fixture
+def yaml_decodes(monkeypatch):
+    calls = _Calls(msgspec.yaml.decode)
+    monkeypatch.setattr(msgspec.yaml, "decode", calls)
+    return calls
+
+
+@pytest.fixture
+def yaml_encodes(monkeypatch):
+    calls = _Calls(msgspec.yaml.encode)
+    monkeypatch.setattr(msgspec.yaml, "encode", calls)
+    return calls
+
+
+@pytest.fixture
+def fake_broker(monkeypatch):
+    monkeypatch.setattr("flowerpower_mqtt.client.aiomqtt.Client", _FakeBroker)
+
+
+def _config(tmp_path, broker="localhost", subscriptions=()):
+    return FlowerPowerMQTTConfig(
+        mqtt=MQTTConfig(broker=broker),
+        subscriptions=list(subscriptions),
+        base_dir=str(tmp_path),
+    )
+
+
+def _write(config_file, config):
+    """Write a config file and move its mtime forward, as a later edit would."""
+    config_file.write_bytes(config.to_yaml_bytes())
+    mtime_ns = config_file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(config_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_cached_load_parses_unchanged_file_once(tmp_path, yaml_decodes):
+    config_file = tmp_path / "mqtt.yml"
+    _write(config_file, _config(tmp_path, broker="broker-a"))
+
+    first = FlowerPowerMQTTConfig.from_yaml_cached(config_file)
+    second = FlowerPowerMQTTConfig.from_yaml_cached(config_file)
+
+    assert yaml_decodes.count == 1
+    assert second.mqtt.broker == "broker-a"
+    # Every call returns its own copy
+    assert second is not first
+    first.subscriptions.append(SubscriptionConfig(topic="a/b", pipeline="p"))
+    assert second.subscriptions == []
+
+
+def test_cached_load_reparses_after_mtime_change(tmp_path, yaml_decodes):
+    config_file = tmp_path / "mqtt.yml"
+    _write(config_file, _config(tmp_path, broker="broker-a"))
+    assert FlowerPowerMQTTConfig.from_yaml_cached(config_file).mqtt.broker == "broker-a"
+
+    _write(config_file, _config(tmp_path, broker="broker-b"))
+
+    assert FlowerPowerMQTTConfig.from_yaml_cached(config_file).mqtt.broker == "broker-b"
+    assert yaml_decodes.count == 2
+
+
+def test_missing_config_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FlowerPowerMQTTConfig.from_yaml_cached(tmp_path / "missing.yml")
+
+
+def test_to_yaml_primes_the_cache(tmp_path, yaml_decodes):
+    config_file = tmp_path / "mqtt.yml"
+    config = _config(tmp_path, subscriptions=[SubscriptionConfig(topic="a/+", pipeline="p", qos=1)])
+
+    config.to_yaml(config_file)
+    loaded = FlowerPowerMQTTConfig.from_yaml_cached(config_file)
+
+    assert yaml_decodes.count == 0
+    assert loaded == config
+    assert FlowerPowerMQTTConfig.from_yaml(config_file) == config
+
+
+def test_save_config_reuses_yaml_until_subscriptions_change(tmp_path, yaml_encodes):
+    plugin = MQTTPlugin(config=_config(tmp_path))
+    first_file = tmp_path / "first.yml"
+    second_file = tmp_path / "second.yml"
+
+    plugin.save_config(first_file)
+    plugin.save_config(second_file)
+
+    assert yaml_encodes.count == 1
+    assert second_file.read_bytes() == first_file.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_save_config_reencodes_after_subscribe(tmp_path, fake_broker, yaml_encodes):
+    plugin = MQTTPlugin(config=_config(tmp_path))
+    config_file = tmp_path / "saved.yml"
+    plugin.save_config(config_file)
+    assert yaml_encodes.count == 1
+
+    await plugin.connect()
+    await plugin.subscribe("sensors/+/data", "sensor_processor", qos=1)
+    plugin.save_config(config_file)
+
+    assert yaml_encodes.count == 2
+    saved = FlowerPowerMQTTConfig.from_yaml(config_file)
+    assert [(sub.topic, sub.pipeline, sub.qos) for sub in saved.subscriptions] == [
+        ("sensors/+/data", "sensor_processor", 1)
+    ]
+
+    await plugin.unsubscribe("sensors/+/data")
+    plugin.save_config(config_file)
+
+    assert yaml_encodes.count == 3
+    assert FlowerPowerMQTTConfig.from_yaml(config_file).subscriptions == []
+    await plugin.disconnect()
+
+
+def test_from_config_returns_new_plugins_by_default(tmp_path):
+    config_file = tmp_path / "mqtt.yml"
+    _write(config_file, _config(tmp_path))
+
+    first = MQTTPlugin.from_config(config_file)
+    second = MQTTPlugin.from_config(config_file)
+    assert first is not second
+
+    # Plugins created without reuse are not handed out to reuse=True calls
+    assert MQTTPlugin.from_config(config_file, reuse=True) is not first
+
+
+def test_from_config_reuse_returns_same_plugin_until_file_changes(tmp_path):
+    config_file = tmp_path / "mqtt.yml"
+    _write(config_file, _config(tmp_path, broker="broker-a"))
+
+    plugin = MQTTPlugin.from_config(config_file, reuse=True)
+    assert MQTTPlugin.from_config(config_file, reuse=True) is plugin
+
+    _write(config_file, _config(tmp_path, broker="broker-b"))
+    reloaded = MQTTPlugin.from_config(config_file, reuse=True)
+
+    assert reloaded is not plugin
+    assert reloaded.config.mqtt.broker == "broker-b"
+
+
+@pytest.mark.asyncio
+async def test_from_config_reuse_skips_disconnected_plugins(tmp_path, fake_broker):
+    config_file = tmp_path / "mqtt.yml"
+    _write(config_file, _config(tmp_path))
+
+    plugin = MQTTPlugin.from_config(config_file, reuse=True)
+    await plugin.connect()
+    assert MQTTPlugin.from_config(config_file, reuse=True) is plugin
+
+    await plugin.disconnect()
+
+    assert MQTTPlugin.from_config(config_file, reuse=True) is not plugin
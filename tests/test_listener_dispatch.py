@@ -0,0 +1,222 @@
+"""Tests for the bounded async hand-off to the job-queue dispatch workers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from flowerpower_mqtt import listener as listener_module
+from flowerpower_mqtt.client import MQTTClient, MQTTMessage
+from flowerpower_mqtt.config import (
+    FlowerPowerMQTTConfig,
+    JobQueueConfig,
+    MQTTConfig,
+    RuntimeSubscription,
+)
+from flowerpower_mqtt.job_handler import execute_pipeline_job
+from flowerpower_mqtt.listener import MQTTListener
+
+
+class _RecordingJobQueueManager:
+    """Stands in for FlowerPower's JobQueueManager and records enqueued jobs."""
+
+    def __init__(self, type, name, base_dir):
+        self.jobs = []
+        self.fail = False
+
+    def enqueue(self, func, *args, **kwargs):
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+        self.jobs.append((func, args, kwargs))
+        return SimpleNamespace(id=f"job-{len(self.jobs)}")
+
+
+class _ScriptedClient(MQTTClient):
+    """MQTT client that delivers a fixed list of messages, then ends the listen loop."""
+
+    def __init__(self, messages=()):
+        super().__init__(MQTTConfig())
+        self._messages = list(messages)
+        self._add_subscription(
+            RuntimeSubscription(topic="sensors/#", pipeline="sensor_processor", execution_mode="async")
+        )
+
+    async def listen_for_messages(self):
+        for message in self._messages:
+            for handler in self._message_handlers:
+                pending = handler(message)
+                if pending is not None:
+                    await pending
+
+
+def _message(index: int = 0) -> MQTTMessage:
+    return MQTTMessage(
+        topic=f"sensors/room{index}/temperature",
+        payload=b'{"temperature": 21.5}',
+        qos=1,
+        retain=False,
+        timestamp=0.0,
+    )
+
+
+@pytest.fixture
+def make_listener(tmp_path, monkeypatch):
+    """Build listeners with the job queue enabled, backed by a recording manager."""
+    monkeypatch.setattr(listener_module, "JobQueueManager", _RecordingJobQueueManager)
+
+    def make(messages=(), **job_queue) -> MQTTListener:
+        config = FlowerPowerMQTTConfig(
+            base_dir=str(tmp_path),
+            job_queue=JobQueueConfig(enabled=True, **job_queue),
+        )
+        return MQTTListener(_ScriptedClient(messages), config)
+
+    return make
+
+
+def _record_batches(listener: MQTTListener, monkeypatch):
+    """Record the topics of every batch handed to the job queue."""
+    batches = []
+    enqueue_batch = listener._enqueue_pipeline_jobs
+
+    def recording(batch):
+        batches.append([message.topic for _, _, message in batch])
+        return enqueue_batch(batch)
+
+    monkeypatch.setattr(listener, "_enqueue_pipeline_jobs", recording)
+    return batches
+
+
+def _submit(listener: MQTTListener, index: int):
+    return listener._submit_pipeline_async("sensor_processor", {"index": index}, _message(index))
+
+
+def _topics(*indices):
+    return [f"sensors/room{index}/temperature" for index in indices]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_awaitable_until_slot_frees(make_listener):
+    # No workers, so nothing drains the queue behind the test's back
+    listener = make_listener(max_inflight=2, dispatch_workers=0)
+    listener._start_dispatch_workers()
+
+    assert _submit(listener, 0) is None
+    assert _submit(listener, 1) is None
+
+    pending = _submit(listener, 2)
+    assert pending is not None
+    put = asyncio.ensure_future(pending)
+    await asyncio.sleep(0.01)
+    assert not put.done()
+    assert listener._async_queue.qsize() == 2
+
+    assert listener._async_queue.get_nowait()[1] == {"index": 0}
+    await asyncio.wait_for(put, timeout=1)
+    assert [listener._async_queue.get_nowait()[1]["index"] for _ in range(2)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_submit_without_workers_enqueues_inline(make_listener):
+    listener = make_listener(max_retries=5)
+    manager = listener.job_queue_manager
+    # The recording manager has no RQ internals, so jobs go through enqueue()
+    assert listener._rq_queue is None
+
+    assert _submit(listener, 0) is None
+
+    assert len(manager.jobs) == 1
+    func, args, kwargs = manager.jobs[0]
+    assert func is execute_pipeline_job
+    assert args[0] == "sensor_processor"
+    assert args[3] == "sensors/room0/temperature"
+    assert kwargs == {"retry": 5}
+    assert listener._pipeline_count == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_flushes_after_interval(make_listener, monkeypatch):
+    listener = make_listener(batch_size=10, flush_interval_ms=50, dispatch_workers=1)
+    batches = _record_batches(listener, monkeypatch)
+    listener._start_dispatch_workers()
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for index in range(3):
+        assert _submit(listener, index) is None
+
+    await asyncio.sleep(0.01)
+    assert batches == []
+
+    await asyncio.wait_for(listener._async_queue.join(), timeout=1)
+    assert loop.time() - start >= 0.05
+    assert batches == [_topics(0, 1, 2)]
+    assert listener._pipeline_count == 3
+
+    await listener._stop_dispatch_workers(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting(make_listener, monkeypatch):
+    listener = make_listener(batch_size=2, flush_interval_ms=10_000, dispatch_workers=1)
+    batches = _record_batches(listener, monkeypatch)
+    listener._start_dispatch_workers()
+
+    for index in range(2):
+        assert _submit(listener, index) is None
+
+    await asyncio.wait_for(listener._async_queue.join(), timeout=1)
+    assert batches == [_topics(0, 1)]
+
+    await listener._stop_dispatch_workers(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_executions(make_listener, monkeypatch):
+    listener = make_listener(batch_size=2, flush_interval_ms=5, dispatch_workers=2)
+    batches = _record_batches(listener, monkeypatch)
+    listener._start_dispatch_workers()
+    tasks = listener._dispatch_tasks
+
+    for index in range(7):
+        assert _submit(listener, index) is None
+
+    await listener._stop_dispatch_workers(timeout=1)
+
+    assert sorted(topic for batch in batches for topic in batch) == _topics(*range(7))
+    assert all(len(batch) <= 2 for batch in batches)
+    assert len(listener.job_queue_manager.jobs) == 7
+    assert listener._pipeline_count == 7
+    assert all(task.done() for task in tasks)
+    assert listener._dispatch_tasks == []
+    assert listener._async_queue is None
+
+
+@pytest.mark.asyncio
+async def test_foreground_listener_drains_queue_when_loop_ends(make_listener):
+    messages = [_message(index) for index in range(5)]
+    listener = make_listener(messages, batch_size=10, flush_interval_ms=50, dispatch_workers=1)
+
+    await listener.start_listener(background=False)
+
+    assert not listener.is_running
+    assert len(listener.job_queue_manager.jobs) == 5
+    assert listener._pipeline_count == 5
+    assert listener._dispatch_tasks == []
+    assert listener._async_queue is None
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_counts_errors_and_still_drains(make_listener):
+    listener = make_listener(batch_size=10, flush_interval_ms=5, dispatch_workers=1)
+    listener.job_queue_manager.fail = True
+    listener._start_dispatch_workers()
+
+    for index in range(3):
+        assert _submit(listener, index) is None
+
+    await listener._stop_dispatch_workers(timeout=1)
+
+    assert listener._error_count == 3
+    assert listener._pipeline_count == 0
+    assert listener._async_queue is None
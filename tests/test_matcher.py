@@ -0,0 +1,110 @@
+"""Tests for topic-filter matching and subscription lookup."""
+
+import pytest
+
+from flowerpower_mqtt.client import MQTTClient
+from flowerpower_mqtt.config import MQTTConfig, RuntimeSubscription
+from flowerpower_mqtt.matcher import MQTTMatcher
+
+
+def _matcher(*filters):
+    matcher = MQTTMatcher()
+    for topic_filter in filters:
+        matcher[topic_filter] = topic_filter
+    return matcher
+
+
+@pytest.mark.parametrize(
+    "topic_filter, topic, expected",
+    [
+        ("sensors/+/temperature", "sensors/room1/temperature", True),
+        ("sensors/+/temperature", "sensors/temperature", False),
+        ("sensors/+/temperature", "sensors/a/b/temperature", False),
+        ("sensors/+", "sensors/", True),
+        ("+/+", "a/b", True),
+        ("+", "/a", False),
+        ("sensors/#", "sensors", True),
+        ("sensors/#", "sensors/a/b/c", True),
+        ("sensors/#", "sensorsx/a", False),
+        ("#", "a/b/c", True),
+        ("a/b", "a/b", True),
+        ("a/b", "a/b/c", False),
+    ],
+)
+def test_wildcards(topic_filter, topic, expected):
+    assert (_matcher(topic_filter).first_match(topic) is not None) is expected
+
+
+@pytest.mark.parametrize("topic_filter", ["#", "+/info", "+/#"])
+def test_first_level_wildcards_skip_dollar_topics(topic_filter):
+    assert _matcher(topic_filter).first_match("$SYS/info") is None
+
+
+def test_dollar_topics_match_explicit_filters():
+    matcher = _matcher("$SYS/#", "$SYS/+/clients")
+    assert list(matcher.iter_match("$SYS/broker/clients")) == ["$SYS/#", "$SYS/+/clients"]
+
+
+def test_shared_subscription_matches_on_filter_after_group():
+    matcher = _matcher("$share/workers/sensors/+")
+    assert matcher.first_match("sensors/a") == "$share/workers/sensors/+"
+    assert matcher.first_match("workers/sensors/a") is None
+
+
+def test_shared_and_plain_filters_are_kept_apart():
+    matcher = _matcher("sensors/+", "$share/workers/sensors/+")
+    assert list(matcher.iter_match("sensors/a")) == ["sensors/+", "$share/workers/sensors/+"]
+
+    del matcher["sensors/+"]
+    assert matcher["$share/workers/sensors/+"] == "$share/workers/sensors/+"
+    assert matcher.first_match("sensors/a") == "$share/workers/sensors/+"
+    with pytest.raises(KeyError):
+        matcher["sensors/+"]
+
+
+def test_overlapping_filters_return_earliest_added():
+    matcher = _matcher("sensors/#", "sensors/+/temperature", "sensors/room1/temperature")
+    assert matcher.first_match("sensors/room1/temperature") == "sensors/#"
+
+    matcher = _matcher("sensors/room1/temperature", "sensors/#")
+    assert matcher.first_match("sensors/room1/temperature") == "sensors/room1/temperature"
+    assert matcher.first_match("sensors/room2/temperature") == "sensors/#"
+
+
+def test_resubscribe_keeps_position_and_updates_value():
+    matcher = _matcher("a/#", "a/b")
+    matcher["a/#"] = "replaced"
+    assert matcher.first_match("a/b") == "replaced"
+
+
+def test_delete_prunes_and_unknown_filters_raise():
+    matcher = _matcher("a/b/c")
+    del matcher["a/b/c"]
+    assert matcher.first_match("a/b/c") is None
+    assert not matcher._root.children
+    with pytest.raises(KeyError):
+        del matcher["a/b/c"]
+
+
+def test_pre_split_filters():
+    matcher = MQTTMatcher()
+    matcher[("sensors", "+")] = 1
+    assert matcher["sensors/+"] == 1
+    assert matcher[("sensors", "+")] == 1
+    assert matcher.first_match("sensors/a") == 1
+    del matcher[("sensors", "+")]
+    assert matcher.first_match("sensors/a") is None
+
+
+def _client(*topics):
+    client = MQTTClient(MQTTConfig())
+    for topic in topics:
+        client._add_subscription(RuntimeSubscription(topic=topic, pipeline=topic))
+    return client
+
+
+def test_find_subscription_keeps_first_match_order():
+    client = _client("sensors/#", "sensors/room1/temperature")
+    # The exact filter was added later, so the earlier wildcard wins
+    assert client.find_subscription_for_topic("sensors/room1/temperature").topic == "sensors/#"
+
@@ -0,0 +1,83 @@
+"""Tests for compiled pipelines and their reloading in the listener."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from hamilton import driver
+
+from flowerpower_mqtt import listener as listener_module
+from flowerpower_mqtt.client import MQTTClient
+from flowerpower_mqtt.config import FlowerPowerMQTTConfig, MQTTConfig
+from flowerpower_mqtt.listener import MQTTListener
+from flowerpower_mqtt.pipeline_compiler import _load_pipeline_module, compile_pipeline
+
+EXAMPLE_PIPELINE = (
+    Path(__file__).resolve().parents[1] / "examples" / "_common" / "pipelines" / "example_pipeline.py"
+)
+FINAL_VARS = ["generate_response", "processed_data"]
+INPUTS = {
+    "mqtt_message": {"sensor_data": {"temperature": 38.5, "humidity": 20}},
+    "mqtt_topic": "sensors/room1/temperature",
+    "mqtt_qos": 1,
+    "execution_timestamp": "2024-01-01T00:00:00",
+    "execution_mode": "sync",
+}
+
+
+def _write_pipeline_config(config_file: Path, final_vars) -> None:
+    config_file.write_text(
+        "run:\n  final_vars:\n" + "".join(f"    - {var}\n" for var in final_vars)
+    )
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A FlowerPower project holding the example pipeline as 'sensor_processor'."""
+    (tmp_path / "pipelines").mkdir()
+    shutil.copy(EXAMPLE_PIPELINE, tmp_path / "pipelines" / "sensor_processor.py")
+    (tmp_path / "conf" / "pipelines").mkdir(parents=True)
+    _write_pipeline_config(tmp_path / "conf" / "pipelines" / "sensor_processor.yml", FINAL_VARS)
+    # The example pipeline appends to a log file in the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_compiled_pipeline_matches_hamilton(project):
+    run, default_inputs, module_file, config_file = compile_pipeline(
+        "sensor_processor", str(project), INPUTS
+    )
+    assert default_inputs == {}
+    assert module_file == project / "pipelines" / "sensor_processor.py"
+    assert config_file == project / "conf" / "pipelines" / "sensor_processor.yml"
+
+    module = _load_pipeline_module("reference", module_file)
+    expected = driver.Builder().with_modules(module).build().execute(FINAL_VARS, inputs=INPUTS)
+
+    result = run(dict(INPUTS))
+    assert list(result) == FINAL_VARS
+    assert result == expected
+    assert result["generate_response"]["alerts"]["combined_alert"] is True
+
+
+def test_listener_recompiles_when_pipeline_config_changes(project, monkeypatch):
+    monkeypatch.setattr(listener_module, "_COMPILED_RECHECK_INTERVAL", 0.0)
+    listener = MQTTListener(
+        MQTTClient(MQTTConfig()),
+        FlowerPowerMQTTConfig(base_dir=str(project), compile_pipelines=True),
+    )
+
+    run, _ = listener._get_compiled_pipeline("sensor_processor")
+    assert list(run(dict(INPUTS))) == FINAL_VARS
+    # Unchanged files keep the compiled function
+    assert listener._get_compiled_pipeline("sensor_processor")[0] is run
+
+    config_file = project / "conf" / "pipelines" / "sensor_processor.yml"
+    _write_pipeline_config(config_file, ["processed_data"])
+    mtime_ns = config_file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(config_file, ns=(mtime_ns, mtime_ns))
+
+    recompiled, _ = listener._get_compiled_pipeline("sensor_processor")
+    assert recompiled is not run
+    assert list(recompiled(dict(INPUTS))) == ["processed_data"]